@@ -5,6 +5,8 @@ This module provides a unified interface for system operations including process
 file system operations, window management, network utilities, and system monitoring.
 """
 
+import threading
+
 # Core modules
 from .system import SystemInfo, SystemMonitor
 from .process import ProcessManager, Process
@@ -17,13 +19,31 @@ from .utils import logger, ErrorHandler
 # Version
 __version__ = '0.1.0'
 
-# Initialize default instances
-system_info = SystemInfo()
-process_manager = ProcessManager()
-file_system = FileSystem()
-window_manager = WindowManager()
-network_manager = NetworkManager()
-automation = Automation()
+# Default instances, created on first access (PEP 562) rather than on import
+_FACTORIES = {
+    'system_info': SystemInfo,
+    'process_manager': ProcessManager,
+    'file_system': FileSystem,
+    'window_manager': WindowManager,
+    'network_manager': NetworkManager,
+    'automation': Automation,
+}
+_INSTANCES = {}
+# Reentrant, in case one default instance's constructor asks for another
+_INSTANCES_LOCK = threading.RLock()
+
+def __getattr__(name):
+    """Lazily construct the shared default instances."""
+    if name in _FACTORIES:
+        instance = _INSTANCES.get(name)
+        if instance is None:
+            with _INSTANCES_LOCK:
+                # Another thread may have created it while we waited
+                instance = _INSTANCES.get(name)
+                if instance is None:
+                    instance = _INSTANCES[name] = _FACTORIES[name]()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Clean up
 __all__ = [
@@ -0,0 +1,9 @@
+"""
+Python version compatibility helpers shared by the systemsolutions modules.
+"""
+
+import sys
+
+# @dataclass(**DATACLASS_SLOTS) gives record types __slots__ (no per-instance
+# __dict__) on Python 3.10+, where dataclass() accepts slots=True
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
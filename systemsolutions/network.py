@@ -2,19 +2,318 @@
 Network utilities and operations.
 """
 
+import asyncio
+import os
 import socket
+import functools
+import importlib.util
 import subprocess
 import ipaddress
 import re
 import json
-import urllib.request
+import selectors
+import struct
+import sys
+import time
 import urllib.error
+import urllib.parse
 from typing import Dict, List, Optional, Tuple, Union, Any
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from ._compat import DATACLASS_SLOTS
 from .utils import ErrorHandler, logger
 
-@dataclass
+
+# optional: enables keep-alive connection reuse in http_request
+_HAS_URLLIB3 = importlib.util.find_spec('urllib3') is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _http_pool():
+    """Shared keep-alive pool so repeated requests to a host skip TCP/TLS setup."""
+    import urllib3
+    return urllib3.PoolManager(num_pools=8, maxsize=16)
+
+
+@functools.lru_cache(maxsize=1)
+def _proxies() -> Dict[str, str]:
+    """Proxy settings, read once like urlopen's default opener does."""
+    from urllib.request import getproxies
+    return getproxies()
+
+
+def _uses_proxy(url: str) -> bool:
+    """Whether urlopen would send this URL through a proxy (HTTP_PROXY, NO_PROXY etc.)."""
+    parts = urllib.parse.urlsplit(url)
+    if not _proxies().get(parts.scheme):
+        return False
+    from urllib.request import proxy_bypass
+    return not proxy_bypass(parts.hostname or '')
+
+
+def _http_pool_errors() -> tuple:
+    """Exception types raised by the urllib3 pool, if it is in use."""
+    if not _HAS_URLLIB3:
+        return ()
+    import urllib3
+    return (urllib3.exceptions.HTTPError,)
+
+# Reply lines and their RTT field in the system ping tool's output
+# (Windows prints "bytes=32 time=12ms" or "time<1ms", Unix "bytes from ... time=12.3 ms")
+_PING_BYTES_RE = re.compile(r'bytes(?: from|=)')
+_PING_TIME_RE = re.compile(r'time[=<]\s*([\d.]+)\s*ms')
+# Seconds a forward DNS lookup from get_ip_address stays cached
+DNS_CACHE_TTL = 60.0
+# Seconds between echo requests to the same host, matching the system ping tool;
+# back-to-back probes get dropped by ICMP rate limiting and show up as loss
+PING_INTERVAL = 1.0
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_hostname() -> str:
+    """Return socket.gethostname(), looked up once per process."""
+    return socket.gethostname()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_fqdn() -> str:
+    """Return socket.getfqdn(), resolved once per process."""
+    return socket.getfqdn()
+
+
+# ICMP echo message types and the payload size the ping tools send by default
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACH = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+_ICMP_HEADER = struct.Struct('!BBHHH')
+_ICMP_PAYLOAD = bytes(range(56))
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 ones'-complement checksum."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _build_echo_request(ident: int, seq: int) -> bytes:
+    """Build an ICMP echo request packet."""
+    header = _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _icmp_checksum(header + _ICMP_PAYLOAD)
+    return _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + _ICMP_PAYLOAD
+
+
+def _parse_icmp(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """Return (type, ident, seq) from a received ICMP datagram.
+    
+    For time-exceeded and unreachable errors, ident and seq are taken from
+    the echo request quoted in the error body.
+    """
+    # Linux strips the IP header on datagram ICMP sockets; raw sockets and BSD/macOS do not
+    if data and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < _ICMP_HEADER.size:
+        return None
+    icmp_type, _, _, ident, seq = _ICMP_HEADER.unpack_from(data)
+    if icmp_type in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH):
+        quoted = data[_ICMP_HEADER.size:]
+        if len(quoted) < 20 + _ICMP_HEADER.size:
+            return None
+        _, _, _, ident, seq = _ICMP_HEADER.unpack_from(quoted, (quoted[0] & 0x0F) * 4)
+    return icmp_type, ident, seq
+
+
+def _open_icmp_socket() -> Optional[socket.socket]:
+    """Open an unprivileged ICMP datagram socket, or None if the OS refuses."""
+    if os.name == 'nt':
+        return None
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError:
+        # e.g. Linux with the user outside net.ipv4.ping_group_range
+        return None
+
+
+def _open_raw_icmp_socket() -> Optional[socket.socket]:
+    """Open a raw ICMP socket (needs root or CAP_NET_RAW), or None if refused."""
+    if os.name == 'nt':
+        return None
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    except OSError:
+        return None
+
+
+def _ping_stats(host: str, sent: int, times: List[float]) -> Dict[str, Any]:
+    """Summarize echo round-trip times in the dict shape ping() returns."""
+    received = len(times)
+    return {
+        'host': host,
+        'sent': sent,
+        'received': received,
+        'lost': sent - received,
+        'loss_percent': (sent - received) / sent * 100 if sent > 0 else 0,
+        'min_time': min(times) if times else 0,
+        'max_time': max(times) if times else 0,
+        'avg_time': sum(times) / len(times) if times else 0,
+        'times': times,
+        'success': received > 0
+    }
+
+
+def _make_hop(hop: int, host: str, times: List[Optional[float]]) -> Dict[str, Any]:
+    """Build a traceroute hop entry, padding to the usual three probes."""
+    times = times + [None] * (3 - len(times))
+    answered = [t for t in times if t is not None]
+    return {
+        'hop': hop,
+        'host': host,
+        'times': times,
+        'avg_time': sum(answered) / len(answered) if answered else None
+    }
+
+
+def _safe_gethostbyaddr(ip: str) -> str:
+    """Reverse-resolve ip, returning ip itself if it has no PTR record."""
+    try:
+        return socket.gethostbyaddr(ip)[0]
+    except OSError:
+        return ip
+
+
+def _parse_traceroute_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a Unix traceroute hop line in one pass over its tokens.
+    
+    Handles "1  gw (192.168.1.1)  1.2 ms  1.1 ms  *", "-n" style lines
+    without the parenthesized address, and all-"*" lines.
+    """
+    toks = line.split()
+    if not toks or not toks[0].isdigit():
+        return None
+    
+    hostname = ip = None
+    times: List[Optional[float]] = []
+    for i, tok in enumerate(toks[1:], 1):
+        if tok == '*':
+            times.append(None)
+        elif tok == 'ms':
+            continue
+        elif tok.startswith('(') and tok.endswith(')'):
+            ip = ip or tok[1:-1]
+        elif tok.replace('.', '', 1).isdigit() and i + 1 < len(toks) and toks[i + 1] == 'ms':
+            times.append(float(tok))
+        elif hostname is None:
+            hostname = tok
+    
+    if hostname is None:
+        host = '* * *'
+    else:
+        ip = ip or hostname
+        host = f"{hostname} ({ip})" if hostname != ip else ip
+    return _make_hop(int(toks[0]), host, times)
+
+
+def _parse_tracert_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a Windows tracert hop line ("1    12 ms    <1 ms     *     host")."""
+    toks = line.split()
+    if len(toks) < 4 or not toks[0].isdigit():
+        return None
+    
+    times: List[Optional[float]] = []
+    i = 1
+    while i < len(toks) and len(times) < 3:
+        tok = toks[i]
+        if tok == '*':
+            times.append(None)
+            i += 1
+        elif tok.lstrip('<').isdigit() and i + 1 < len(toks) and toks[i + 1] == 'ms':
+            # "<1 ms" is reported as its 1 ms upper bound
+            times.append(float(tok.lstrip('<')))
+            i += 2
+        else:
+            return None
+    
+    host = ' '.join(toks[i:])
+    if not host or host.startswith('Request timed out'):
+        host = '* * *'
+    return _make_hop(int(toks[0]), host, times)
+
+
+def _iter_command_lines(cmd: List[str]):
+    """Run cmd, yielding its combined stdout/stderr lines as they arrive.
+    
+    Raises subprocess.CalledProcessError once the output is exhausted if the
+    command exited non-zero, mirroring subprocess.check_output.
+    """
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True, bufsize=1) as proc:
+        yield from proc.stdout
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _ping_cmd_unix(count: int, timeout: int, host: str) -> List[str]:
+    """Build the Unix/Linux/Mac ping command line."""
+    return ['ping', '-c', str(count), '-W', str(timeout), host]
+
+
+def _ping_cmd_windows(count: int, timeout: int, host: str) -> List[str]:
+    """Build the Windows ping command line."""
+    return ['ping', '-n', str(count), '-w', str(timeout * 1000), host]
+
+
+def _parse_ping_unix(lines) -> Tuple[int, List[float]]:
+    """Return (sent, times) from Unix/Linux/Mac ping output."""
+    sent = 0
+    times = []
+    for line in lines:
+        if _PING_BYTES_RE.search(line):
+            sent += 1
+            m = _PING_TIME_RE.search(line)
+            if m:
+                times.append(float(m.group(1)))
+    return sent, times
+
+
+def _parse_ping_windows(lines) -> Tuple[int, List[float]]:
+    """Return (sent, times) from Windows ping output."""
+    sent = 0
+    times = []
+    for line in lines:
+        m = _PING_TIME_RE.search(line)
+        if m and _PING_BYTES_RE.search(line):
+            sent += 1
+            # "time<1ms" is reported as its 1 ms upper bound, as in tracert parsing
+            times.append(int(m.group(1)))
+    return sent, times
+
+
+def _traceroute_cmd_unix(max_hops: int, timeout: int, host: str) -> List[str]:
+    """Build the Unix/Linux/Mac traceroute command line."""
+    return ['traceroute', '-m', str(max_hops), '-w', str(timeout), host]
+
+
+def _traceroute_cmd_windows(max_hops: int, timeout: int, host: str) -> List[str]:
+    """Build the Windows tracert command line."""
+    return ['tracert', '-h', str(max_hops), '-w', str(timeout * 1000), host]
+
+
+# Platform-specific command builders and parsers, chosen once at import
+if os.name == 'nt':
+    _PING_CMD, _ping_parser = _ping_cmd_windows, _parse_ping_windows
+    _TRACEROUTE_CMD, _traceroute_parser = _traceroute_cmd_windows, _parse_tracert_line
+else:
+    _PING_CMD, _ping_parser = _ping_cmd_unix, _parse_ping_unix
+    _TRACEROUTE_CMD, _traceroute_parser = _traceroute_cmd_unix, _parse_traceroute_line
+
+
+
+@dataclass(**DATACLASS_SLOTS)
 class NetworkInterface:
     """Network interface information."""
     name: str
@@ -25,6 +324,7 @@ class NetworkInterface:
     ipv6_addresses: List[str]
     netmask: str
     broadcast: str
+    netmask_bits: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -36,10 +336,23 @@ class NetworkInterface:
             'ipv4_addresses': self.ipv4_addresses,
             'ipv6_addresses': self.ipv6_addresses,
             'netmask': self.netmask,
-            'broadcast': self.broadcast
+            'broadcast': self.broadcast,
+            'netmask_bits': self.netmask_bits
         }
+    
+    def contains(self, ip: str) -> bool:
+        """Check whether an IPv4 address is on this interface's subnet."""
+        if not self.netmask_bits or not self.ipv4_addresses:
+            return False
+        mask = (0xFFFFFFFF << (32 - self.netmask_bits)) & 0xFFFFFFFF
+        # The netmask belongs to the last IPv4 address collected for the interface
+        network = int.from_bytes(socket.inet_aton(self.ipv4_addresses[-1]), 'big') & mask
+        try:
+            return int.from_bytes(socket.inet_aton(ip), 'big') & mask == network
+        except OSError:
+            return False
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class NetworkConnection:
     """Network connection information."""
     fd: int
@@ -65,15 +378,19 @@ class NetworkConnection:
 class NetworkManager:
     """Manages network operations and information."""
     
-    def __init__(self):
+    def __init__(self, interfaces_cache_ttl: float = 5.0):
         self.error_handler = ErrorHandler()
+        self._if_cache: Optional[Dict[str, NetworkInterface]] = None
+        self._if_cache_ts = 0.0
+        self._if_cache_ttl = interfaces_cache_ttl
+        self._dns_cache: Dict[str, Tuple[float, str]] = {}
     
     # ========== Network Information ==========
     
     def get_hostname(self) -> str:
         """Get the hostname of the system."""
         try:
-            return socket.gethostname()
+            return _cached_hostname()
         except Exception as e:
             self.error_handler.log_error(f"Error getting hostname: {e}")
             return ""
@@ -81,7 +398,7 @@ class NetworkManager:
     def get_fqdn(self) -> str:
         """Get the fully qualified domain name."""
         try:
-            return socket.getfqdn()
+            return _cached_fqdn()
         except Exception as e:
             self.error_handler.log_error(f"Error getting FQDN: {e}")
             return ""
@@ -89,138 +406,86 @@ class NetworkManager:
     def get_ip_address(self, hostname: str = None) -> str:
         """Get the IP address for a hostname (default: localhost)."""
         try:
-            hostname = hostname or socket.gethostname()
-            return socket.gethostbyname(hostname)
+            hostname = hostname or _cached_hostname()
+            
+            # Literal addresses need no resolver round trip
+            try:
+                return str(ipaddress.ip_address(hostname))
+            except ValueError:
+                pass
+            
+            now = time.monotonic()
+            cached = self._dns_cache.get(hostname)
+            if cached is not None and now - cached[0] < DNS_CACHE_TTL:
+                return cached[1]
+            
+            address = socket.gethostbyname(hostname)
+            self._dns_cache[hostname] = (now, address)
+            return address
         except Exception as e:
             self.error_handler.log_error(f"Error getting IP address for {hostname}: {e}")
             return ""
     
     def get_mac_address(self, interface: str = None) -> str:
-        """Get the MAC address of a network interface."""
+        """Get the MAC address of a network interface (default: the one used for outbound traffic)."""
         try:
-            if hasattr(socket, 'AF_LINK'):
-                # macOS/Linux
-                import fcntl
-                import struct
-                
-                if not interface:
-                    # Get default interface
-                    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                        s.connect(("8.8.8.8", 80))
-                        interface = s.getsockname()[0]
-                
-                with open(f"/sys/class/net/{interface}/address") as f:
-                    return f.read().strip()
+            interfaces = self.get_network_interfaces()
+            
+            if interface:
+                iface = interfaces.get(interface)
             else:
-                # Windows
-                import ctypes
-                import ctypes.wintypes
-                
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                info = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET, socket.SOCK_DGRAM)
-                ip = info[0][4][0]
-                
-                # Use the Windows API to get the MAC address
-                class MIB_IPNETROW(ctypes.Structure):
-                    _fields_ = [
-                        ("dwIndex", ctypes.wintypes.DWORD),
-                        ("dwPhysAddrLen", ctypes.wintypes.DWORD),
-                        ("bPhysAddr", ctypes.c_ubyte * 8),
-                        ("dwAddr", ctypes.wintypes.DWORD),
-                        ("dwType", ctypes.wintypes.DWORD)
-                    ]
-                
-                GetIpNetTable = ctypes.windll.iphlpapi.GetIpNetTable
-                GetIpNetTable.argtypes = [ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong), bool]
-                GetIpNetTable.restype = ctypes.c_uint
-                
-                GetAdaptersInfo = ctypes.windll.iphlpapi.GetAdaptersInfo
-                GetAdaptersInfo.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong)]
-                GetAdaptersInfo.restype = ctypes.c_uint
-                
-                # First call to get the buffer size
-                buf_len = ctypes.c_ulong(0)
-                GetAdaptersInfo(None, ctypes.byref(buf_len))
-                
-                # Allocate the buffer
-                buf = ctypes.create_string_buffer(buf_len.value)
-                
-                # Second call to get the actual data
-                if GetAdaptersInfo(ctypes.byref(buf), ctypes.byref(buf_len)) != 0:
-                    raise OSError("Failed to get adapter info")
-                
-                # Parse the result
-                class IP_ADAPTER_INFO(ctypes.Structure):
-                    pass
-                
-                IP_ADAPTER_INFO._fields_ = [
-                    ("next", ctypes.POINTER(IP_ADAPTER_INFO)),
-                    ("ComboIndex", ctypes.c_ulong),
-                    ("AdapterName", ctypes.c_char * 260),
-                    ("Description", ctypes.c_char * 132),
-                    ("AddressLength", ctypes.c_uint),
-                    ("Address", ctypes.c_ubyte * 8),
-                    ("Index", ctypes.c_ulong),
-                    ("Type", ctypes.c_uint),
-                    ("DhcpEnabled", ctypes.c_uint),
-                    ("CurrentIpAddress", ctypes.c_void_p),
-                    ("IpAddressList", ctypes.c_ulong * 4),  # Simplified
-                    ("GatewayList", ctypes.c_ulong * 4),    # Simplified
-                    ("DhcpServer", ctypes.c_ulong * 4),     # Simplified
-                    ("HaveWins", ctypes.c_uint),
-                    ("PrimaryWinsServer", ctypes.c_ulong * 4),  # Simplified
-                    ("SecondaryWinsServer", ctypes.c_ulong * 4),  # Simplified
-                    ("LeaseObtained", ctypes.c_ulong),
-                    ("LeaseExpires", ctypes.c_ulong)
-                ]
-                
-                adapter = ctypes.cast(ctypes.byref(buf), ctypes.POINTER(IP_ADAPTER_INFO)).contents
-                
-                while True:
-                    # Check if this is the adapter we're looking for
-                    if socket.inet_ntoa(adapter.IpAddressList[0].to_bytes(4, 'little')) == ip:
-                        return ":".join(f"{b:02x}" for b in adapter.Address[:adapter.AddressLength])
-                    
-                    if not adapter.next:
-                        break
-                    adapter = adapter.next.contents
-                
+                # Connecting a UDP socket picks the outbound address without sending anything
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                    s.connect(("8.8.8.8", 80))
+                    local_ip = s.getsockname()[0]
+                iface = next((i for i in interfaces.values() if local_ip in i.ipv4_addresses), None)
+            
+            if iface is None:
                 return ""
-                
+            # psutil reports Windows MACs as AA-BB-..., normalize to aa:bb:...
+            return iface.mac_address.replace('-', ':').lower()
         except Exception as e:
             self.error_handler.log_error(f"Error getting MAC address: {e}")
             return ""
     
     def get_network_interfaces(self) -> Dict[str, NetworkInterface]:
-        """Get information about all network interfaces."""
+        """Get information about all network interfaces.
+        
+        Results are reused for interfaces_cache_ttl seconds; call
+        invalidate_interfaces_cache() to force a fresh enumeration.
+        """
+        now = time.monotonic()
+        if self._if_cache is not None and now - self._if_cache_ts < self._if_cache_ttl:
+            return dict(self._if_cache)
+        
         try:
-            import psutil
-            
             interfaces = {}
             
+            # Imported here: psutil is slow to import and most callers never need it
+            import psutil
+            
             # Get network interface information
             addrs = psutil.net_if_addrs()
             stats = psutil.net_if_stats()
+            AF_INET, AF_INET6, AF_LINK = socket.AF_INET, socket.AF_INET6, psutil.AF_LINK
             
             for name, addrs_list in addrs.items():
-                is_up = name in stats and stats[name].isup
-                mtu = stats[name].mtu if name in stats else 1500
+                st = stats.get(name)
+                is_up = st.isup if st else False
+                mtu = st.mtu if st else 1500
                 
-                ipv4_addrs = []
-                ipv6_addrs = []
-                mac_address = ""
-                netmask = ""
-                broadcast = ""
+                ipv4 = [a for a in addrs_list if a.family == AF_INET]
+                ipv4_addrs = [a.address for a in ipv4]
+                ipv6_addrs = [a.address for a in addrs_list if a.family == AF_INET6]
+                mac_address = next((a.address for a in reversed(addrs_list) if a.family == AF_LINK), "")
                 
-                for addr in addrs_list:
-                    if addr.family == socket.AF_INET:
-                        ipv4_addrs.append(addr.address)
-                        netmask = addr.netmask or ""
-                        broadcast = addr.broadcast or ""
-                    elif addr.family == socket.AF_INET6:
-                        ipv6_addrs.append(addr.address)
-                    elif addr.family == psutil.AF_LINK:
-                        mac_address = addr.address
+                # Netmask and broadcast come from the last IPv4 address
+                netmask = (ipv4[-1].netmask or "") if ipv4 else ""
+                broadcast = (ipv4[-1].broadcast or "") if ipv4 else ""
+                try:
+                    netmask_bits = bin(int.from_bytes(socket.inet_aton(netmask), 'big')).count('1') if netmask else 0
+                except OSError:
+                    netmask_bits = 0
                 
                 interfaces[name] = NetworkInterface(
                     name=name,
@@ -230,19 +495,24 @@ class NetworkManager:
                     ipv4_addresses=ipv4_addrs,
                     ipv6_addresses=ipv6_addrs,
                     netmask=netmask,
-                    broadcast=broadcast
+                    broadcast=broadcast,
+                    netmask_bits=netmask_bits
                 )
             
-            return interfaces
+            self._if_cache = interfaces
+            self._if_cache_ts = now
+            return dict(interfaces)
         except Exception as e:
             self.error_handler.log_error(f"Error getting network interfaces: {e}")
             return {}
     
+    def invalidate_interfaces_cache(self) -> None:
+        """Drop the cached get_network_interfaces() result."""
+        self._if_cache = None
+    
     def get_network_connections(self, kind: str = 'inet') -> List[NetworkConnection]:
         """Get network connections."""
         try:
-            import psutil
-            
             connections = []
             
             # Map kind to psutil connection kind
@@ -262,6 +532,7 @@ class NetworkManager:
             
             kind = kind_map.get(kind.lower(), 'inet')
             
+            import psutil
             for conn in psutil.net_connections(kind=kind):
                 connections.append(NetworkConnection(
                     fd=conn.fd,
@@ -280,67 +551,135 @@ class NetworkManager:
     
     # ========== Network Testing ==========
     
-    def ping(self, host: str, count: int = 4, timeout: int = 2) -> Dict[str, Any]:
-        """Ping a host and return the results."""
-        try:
-            # Prepare the command based on the platform
-            if os.name == 'nt':
-                # Windows
-                cmd = ['ping', '-n', str(count), '-w', str(timeout * 1000), host]
-            else:
-                # Unix/Linux/Mac
-                cmd = ['ping', '-c', str(count), '-W', str(timeout), host]
-            
-            # Run the ping command
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, universal_newlines=True)
-            
-            # Parse the output
-            sent = 0
-            received = 0
+    def _ping_native(self, host: str, count: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Ping over an unprivileged ICMP socket; None if such sockets are unavailable."""
+        sock = _open_icmp_socket()
+        if sock is None:
+            return None
+        
+        with sock:
+            address = socket.gethostbyname(host)
+            ident = os.getpid() & 0xFFFF
             times = []
+            start = None
             
-            if os.name == 'nt':
-                # Windows output parsing
-                for line in output.split('\n'):
-                    if 'bytes=' in line and 'time=' in line:
-                        sent += 1
-                        if 'time=' in line and 'timeout' not in line:
-                            received += 1
-                            time_ms = int(line.split('time=')[1].split('ms')[0].strip())
-                            times.append(time_ms)
-            else:
-                # Unix/Linux/Mac output parsing
-                for line in output.split('\n'):
-                    if 'bytes from' in line:
-                        sent += 1
-                        if 'time=' in line:
-                            received += 1
-                            time_ms = float(line.split('time=')[1].split(' ')[0])
-                            times.append(time_ms)
-            
-            # Calculate statistics
-            lost = sent - received
-            loss_percent = (lost / sent * 100) if sent > 0 else 0
+            for seq in range(1, count + 1):
+                if start is not None:
+                    delay = start + PING_INTERVAL - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                start = time.perf_counter()
+                sock.sendto(_build_echo_request(ident, seq), (address, 0))
+                deadline = start + timeout
+                
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    sock.settimeout(remaining)
+                    try:
+                        data = sock.recv(1024)
+                    except socket.timeout:
+                        break
+                    
+                    reply = _parse_icmp(data)
+                    # Linux rewrites the identifier to the socket's port, so only match it elsewhere
+                    if (reply and reply[0] == ICMP_ECHO_REPLY and reply[2] == seq
+                            and (sys.platform.startswith('linux') or reply[1] == ident)):
+                        times.append(round((time.perf_counter() - start) * 1000, 3))
+                        break
+        
+        return _ping_stats(host, count, times)
+    
+    def ping_many(self, hosts: List[str], count: int = 1,
+                  timeout: float = 2) -> Dict[str, Dict[str, Any]]:
+        """Ping several hosts at once, returning ping()-style results per host.
+        
+        Each round sends one echo request to every host over a single ICMP
+        socket and waits at most timeout seconds for all replies. Rounds
+        start PING_INTERVAL seconds apart, so total time is about count *
+        max(PING_INTERVAL, timeout) rather than growing with the number of
+        hosts. Without ICMP socket support, hosts are pinged in
+        parallel threads instead.
+        """
+        sock = _open_icmp_socket()
+        if sock is None:
+            with ThreadPoolExecutor(max_workers=min(32, len(hosts) or 1)) as executor:
+                results = executor.map(lambda h: self.ping(h, count, timeout), hosts)
+                return dict(zip(hosts, results))
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        targets: Dict[str, str] = {}
+        for host in hosts:
+            try:
+                targets[host] = socket.gethostbyname(host)
+            except OSError as e:
+                self.error_handler.log_error(f"Error pinging {host}: {e}")
+                results[host] = {'host': host, 'error': str(e), 'success': False}
+        
+        times: Dict[str, List[float]] = {host: [] for host in targets}
+        ident = os.getpid() & 0xFFFF
+        seq = 0
+        
+        with sock, selectors.DefaultSelector() as selector:
+            sock.setblocking(False)
+            selector.register(sock, selectors.EVENT_READ)
             
-            if times:
-                min_time = min(times)
-                max_time = max(times)
-                avg_time = sum(times) / len(times)
-            else:
-                min_time = max_time = avg_time = 0
+            round_start = None
+            for _ in range(count):
+                if round_start is not None:
+                    delay = round_start + PING_INTERVAL - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                round_start = time.perf_counter()
+                # seq -> (host, send time) for requests still awaiting a reply
+                pending: Dict[int, Tuple[str, float]] = {}
+                for host, address in targets.items():
+                    seq = seq % 0xFFFF + 1
+                    try:
+                        sock.sendto(_build_echo_request(ident, seq), (address, 0))
+                    except OSError as e:
+                        self.error_handler.log_error(f"Error pinging {host}: {e}")
+                        continue
+                    pending[seq] = (host, time.perf_counter())
+                
+                deadline = time.perf_counter() + timeout
+                while pending:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not selector.select(remaining):
+                        break
+                    while True:
+                        try:
+                            data = sock.recv(1024)
+                        except BlockingIOError:
+                            break
+                        except OSError:
+                            # A queued ICMP error for one host; keep draining
+                            continue
+                        reply = _parse_icmp(data)
+                        if (reply and reply[0] == ICMP_ECHO_REPLY and reply[2] in pending
+                                and (sys.platform.startswith('linux') or reply[1] == ident)):
+                            host, start = pending.pop(reply[2])
+                            times[host].append(round((time.perf_counter() - start) * 1000, 3))
+        
+        for host in targets:
+            results[host] = _ping_stats(host, count, times[host])
+        return {host: results[host] for host in hosts}
+    
+    def ping(self, host: str, count: int = 4, timeout: int = 2) -> Dict[str, Any]:
+        """Ping a host and return the results.
+        
+        Uses an in-process ICMP socket where the OS allows it, falling back
+        to the system ping tool otherwise.
+        """
+        try:
+            result = self._ping_native(host, count, timeout)
+            if result is not None:
+                return result
             
-            return {
-                'host': host,
-                'sent': sent,
-                'received': received,
-                'lost': lost,
-                'loss_percent': loss_percent,
-                'min_time': min_time,
-                'max_time': max_time,
-                'avg_time': avg_time,
-                'times': times,
-                'success': received > 0
-            }
+            # Run the ping command, parsing replies as they are printed
+            sent, times = _ping_parser(_iter_command_lines(_PING_CMD(count, timeout, host)))
+            return _ping_stats(host, sent, times)
         except subprocess.CalledProcessError as e:
             self.error_handler.log_error(f"Ping failed: {e}")
             return {
@@ -364,93 +703,94 @@ class NetworkManager:
                 'success': False
             }
     
-    def traceroute(self, host: str, max_hops: int = 30, timeout: int = 1) -> List[Dict[str, Any]]:
-        """Perform a traceroute to a host."""
-        try:
-            import subprocess
-            import re
+    async def ping_async(self, host: str, count: int = 4, timeout: int = 2) -> Dict[str, Any]:
+        """Awaitable ping(), run on the event loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.ping, host, count, timeout))
+    
+    def _traceroute_native(self, host: str, max_hops: int, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """Traceroute over a raw ICMP socket; None if raw sockets are unavailable."""
+        sock = _open_raw_icmp_socket()
+        if sock is None:
+            return None
+        
+        with sock:
+            address = socket.gethostbyname(host)
+            ident = os.getpid() & 0xFFFF
+            probes: List[Tuple[Optional[str], List[Optional[float]]]] = []
+            seq = 0
             
-            # Prepare the command based on the platform
-            if os.name == 'nt':
-                # Windows
-                cmd = ['tracert', '-h', str(max_hops), '-w', str(timeout * 1000), host]
+            for ttl in range(1, max_hops + 1):
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                hop_addr = None
+                reached = False
+                times: List[Optional[float]] = []
+                
+                for _ in range(3):
+                    seq = seq % 0xFFFF + 1
+                    start = time.perf_counter()
+                    sock.sendto(_build_echo_request(ident, seq), (address, 0))
+                    deadline = start + timeout
+                    rtt = None
+                    
+                    while True:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        sock.settimeout(remaining)
+                        try:
+                            data, (src, _) = sock.recvfrom(1024)
+                        except socket.timeout:
+                            break
+                        
+                        # A raw socket sees every ICMP packet, so match on the probe's ident/seq
+                        reply = _parse_icmp(data)
+                        if reply and reply[1] == ident and reply[2] == seq and reply[0] in (
+                                ICMP_ECHO_REPLY, ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH):
+                            rtt = round((time.perf_counter() - start) * 1000, 3)
+                            hop_addr = hop_addr or src
+                            reached = reached or reply[0] != ICMP_TIME_EXCEEDED
+                            break
+                    times.append(rtt)
+                
+                probes.append((hop_addr, times))
+                if reached:
+                    break
+        
+        # Reverse lookups run concurrently so the slowest PTR query bounds the total
+        ips = sorted({addr for addr, _ in probes if addr})
+        names: Dict[str, str] = {}
+        if ips:
+            with ThreadPoolExecutor(max_workers=min(16, len(ips))) as executor:
+                names = dict(zip(ips, executor.map(_safe_gethostbyaddr, ips)))
+        
+        hops = []
+        for ttl, (addr, times) in enumerate(probes, 1):
+            if addr is None:
+                host = '* * *'
             else:
-                # Unix/Linux/Mac
-                cmd = ['traceroute', '-m', str(max_hops), '-w', str(timeout), host]
-            
-            # Run the traceroute command
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, universal_newlines=True)
+                name = names.get(addr, addr)
+                host = f"{name} ({addr})" if name != addr else addr
+            hops.append(_make_hop(ttl, host, times))
+        return hops
+    
+    def traceroute(self, host: str, max_hops: int = 30, timeout: int = 1) -> List[Dict[str, Any]]:
+        """Perform a traceroute to a host.
+        
+        Probes from an in-process raw ICMP socket when the process may open
+        one, falling back to the system traceroute tool otherwise.
+        """
+        try:
+            hops = self._traceroute_native(host, max_hops, timeout)
+            if hops is not None:
+                return hops
             
-            # Parse the output
+            # Run the traceroute command, parsing hops as they are printed
             hops = []
-            
-            if os.name == 'nt':
-                # Windows output parsing
-                for line in output.split('\n'):
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    # Match lines like: 1     1 ms    <1 ms    <1 ms  192.168.1.1
-                    match = re.match(r'^\s*(\d+)\s+([\d\*]+)\s*ms\s+([\d\*]+)\s*ms\s+([\d\*]+)\s*ms\s+(.+)$', line)
-                    if match:
-                        hop_num = int(match.group(1))
-                        times = []
-                        for t in match.groups()[1:4]:
-                            if t == '*':
-                                times.append(None)
-                            else:
-                                times.append(float(t))
-                        
-                        host = match.group(5).strip()
-                        if host.startswith('Request timed out.'):
-                            host = '* * *'
-                        
-                        hops.append({
-                            'hop': hop_num,
-                            'host': host,
-                            'times': times,
-                            'avg_time': sum(t for t in times if t is not None) / len([t for t in times if t is not None]) if any(t is not None for t in times) else None
-                        })
-            else:
-                # Unix/Linux/Mac output parsing
-                for line in output.split('\n'):
-                    line = line.strip()
-                    if not line or line.startswith('traceroute'):
-                        continue
-                    
-                    # Match lines like: 1  192.168.1.1 (192.168.1.1)  1.234 ms  1.123 ms  1.456 ms
-                    match = re.match(r'^\s*(\d+)\s+([^\s]+)\s+\(([^)]+)\)\s+([\d.]+)\s*ms(?:\s+([\d.]+)\s*ms)?(?:\s+([\d.]+)\s*ms)?', line)
-                    if not match:
-                        # Try matching lines without hostname: 1  * * *
-                        match = re.match(r'^\s*(\d+)\s+\*\s*\*\s*\*', line)
-                        if match:
-                            hop_num = int(match.group(1))
-                            hops.append({
-                                'hop': hop_num,
-                                'host': '* * *',
-                                'times': [None, None, None],
-                                'avg_time': None
-                            })
-                        continue
-                    
-                    hop_num = int(match.group(1))
-                    hostname = match.group(2)
-                    ip = match.group(3)
-                    times = []
-                    
-                    for t in match.groups()[3:]:
-                        if t is not None and t.replace('.', '').isdigit():
-                            times.append(float(t))
-                    
-                    host = f"{hostname} ({ip})" if hostname != ip else ip
-                    
-                    hops.append({
-                        'hop': hop_num,
-                        'host': host,
-                        'times': times + [None] * (3 - len(times)),
-                        'avg_time': sum(times) / len(times) if times else None
-                    })
+            for line in _iter_command_lines(_TRACEROUTE_CMD(max_hops, timeout, host)):
+                hop = _traceroute_parser(line)
+                if hop is not None:
+                    hops.append(hop)
             
             return hops
         except subprocess.CalledProcessError as e:
@@ -469,10 +809,6 @@ class NetworkManager:
                     timeout: int = 10) -> Dict[str, Any]:
         """Perform an HTTP request."""
         try:
-            import urllib.request
-            import urllib.parse
-            import json
-            
             # Prepare the request
             if headers is None:
                 headers = {}
@@ -498,27 +834,22 @@ class NetworkManager:
                 body = json.dumps(json_data).encode('utf-8')
                 headers['Content-Type'] = 'application/json'
             
+            # The pool does not know about proxies; proxied requests go through urlopen
+            if _HAS_URLLIB3 and not _uses_proxy(url):
+                return self._pooled_request(url, method.upper(), headers, body, timeout)
+            
             # Create the request
-            req = urllib.request.Request(url, data=body, headers=headers, method=method.upper())
+            from urllib.request import Request, urlopen
+            req = Request(url, data=body, headers=headers, method=method.upper())
             
             # Send the request and get the response
-            with urllib.request.urlopen(req, timeout=timeout) as response:
+            with urlopen(req, timeout=timeout) as response:
                 content = response.read().decode('utf-8')
-                
-                # Try to parse as JSON if the content type is JSON
-                content_type = response.getheader('Content-Type', '')
-                json_response = None
-                if 'application/json' in content_type:
-                    try:
-                        json_response = json.loads(content)
-                    except json.JSONDecodeError:
-                        pass
-                
                 return {
                     'status_code': response.status,
                     'headers': dict(response.getheaders()),
                     'content': content,
-                    'json': json_response,
+                    'json': self._parse_json(content, response.getheader('Content-Type', '')),
                     'url': response.geturl(),
                     'success': 200 <= response.status < 400
                 }
@@ -531,7 +862,7 @@ class NetworkManager:
                 'success': False,
                 'error': str(e)
             }
-        except urllib.error.URLError as e:
+        except (urllib.error.URLError,) + _http_pool_errors() as e:
             return {
                 'status_code': None,
                 'headers': {},
@@ -551,18 +882,89 @@ class NetworkManager:
                 'error': str(e)
             }
     
-    def download_file(self, url: str, destination: str, chunk_size: int = 8192) -> Dict[str, Any]:
+    def http_request_many(self, requests: List[Union[str, Dict[str, Any]]],
+                          max_workers: int = 16) -> List[Dict[str, Any]]:
+        """Perform several HTTP requests concurrently.
+        
+        Each item is a URL or a dict of http_request() keyword arguments;
+        results are returned in the same order. With urllib3 installed the
+        workers share the keep-alive pool, which holds up to 16 connections
+        per host.
+        """
+        requests = list(requests)
+        if not requests:
+            return []
+        if _HAS_URLLIB3:
+            # Create the shared pool once before fanning out
+            _http_pool()
+        
+        def run(req: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+            return self.http_request(req) if isinstance(req, str) else self.http_request(**req)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+            return list(executor.map(run, requests))
+    
+    async def http_request_async(self, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Awaitable http_request(), run on the event loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.http_request, url, **kwargs))
+    
+    def _pooled_request(self, url: str, method: str, headers: Dict[str, str],
+                        body: Optional[bytes], timeout: float) -> Dict[str, Any]:
+        """Send a request on the shared urllib3 pool, shaped like http_request's result."""
+        import urllib3
+        response = _http_pool().request(
+            method, url, headers=headers, body=body, timeout=timeout,
+            retries=urllib3.Retry(connect=0, read=0, status=0, redirect=10)
+        )
+        content = response.data.decode('utf-8')
+        if response.status >= 400:
+            # Same shape as the urllib.error.HTTPError result
+            return {
+                'status_code': response.status,
+                'headers': dict(response.headers),
+                'content': content,
+                'url': url,
+                'success': False,
+                'error': f"HTTP Error {response.status}: {response.reason}"
+            }
+        return {
+            'status_code': response.status,
+            'headers': dict(response.headers),
+            'content': content,
+            'json': self._parse_json(content, response.headers.get('Content-Type', '')),
+            # urllib3 may report the final redirect target relative to the request URL
+            'url': urllib.parse.urljoin(url, getattr(response, 'url', None) or response.geturl() or url),
+            'success': 200 <= response.status < 400
+        }
+    
+    @staticmethod
+    def _parse_json(content: str, content_type: str) -> Any:
+        """Decode content as JSON if the response declares it, else None."""
+        if 'application/json' in content_type:
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError:
+                pass
+        return None
+    
+    def download_file(self, url: str, destination: str, chunk_size: int = 1 << 20) -> Dict[str, Any]:
         """Download a file from a URL."""
         try:
-            import urllib.request
-            import shutil
+            if chunk_size < 1:
+                # A zero-length buffer would read nothing and "succeed" with an empty file
+                raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
             
             # Create the destination directory if it doesn't exist
             os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
             
-            # Download the file
-            with urllib.request.urlopen(url) as response, open(destination, 'wb') as out_file:
-                shutil.copyfileobj(response, out_file, chunk_size)
+            from urllib.request import urlopen
+            
+            # Download the file, reading each chunk into one reused buffer
+            with urlopen(url) as response, open(destination, 'wb') as out_file:
+                buf = memoryview(bytearray(chunk_size))
+                while n := response.readinto(buf):
+                    out_file.write(buf[:n])
             
             return {
                 'success': True,
@@ -2,16 +2,96 @@
 Process management and monitoring utilities.
 """
 
+import array
 import os
+import re
+import functools
 import psutil
+import shlex
 import signal
 import subprocess
+import threading
 import time
-from typing import Dict, List, Optional, Union, Any, Callable
-from dataclasses import dataclass, asdict
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Pattern, Union, Any, Callable
+from dataclasses import dataclass, fields
+from ._compat import DATACLASS_SLOTS
 from .utils import ErrorHandler, logger
 
-@dataclass
+# psutil < 6.0 re-validates every cached Process against PID reuse on each process_iter() step
+_PROCESS_ITER_CHECKS_REUSE = tuple(int(v) for v in psutil.__version__.split('.')[:2]) < (6, 0)
+
+
+def _iter_processes(attrs: List[str]):
+    """Yield psutil.Process objects with .info filled in for attrs.
+    
+    On psutil versions whose process_iter() re-checks cached processes for
+    PID reuse, fresh objects are built from psutil.pids() instead, which
+    skips that extra round trip per process.
+    """
+    if not _PROCESS_ITER_CHECKS_REUSE:
+        yield from psutil.process_iter(attrs)
+        return
+    for pid in psutil.pids():
+        try:
+            proc = psutil.Process(pid)
+            proc.info = proc.as_dict(attrs=attrs, ad_value=None)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        yield proc
+
+
+# Per-thread parent -> children PID map captured by snapshot()
+_snapshot_state = threading.local()
+
+
+@contextmanager
+def snapshot():
+    """Share one scan of the process tree across the calls in a with-block.
+    
+    Inside the block, Process.get_children() walks the captured
+    parent/child map in memory instead of rescanning every process.
+    Nested blocks reuse the outer snapshot.
+    """
+    if getattr(_snapshot_state, 'children', None) is not None:
+        yield
+        return
+    
+    children: Dict[int, List[int]] = defaultdict(list)
+    for proc in psutil.process_iter(['ppid']):
+        if proc.info['ppid'] is not None:
+            children[proc.info['ppid']].append(proc.pid)
+    _snapshot_state.children = children
+    try:
+        yield
+    finally:
+        _snapshot_state.children = None
+
+
+@functools.lru_cache(maxsize=64)
+def _split_command(command: str) -> tuple:
+    """shlex-split a command string, memoized for commands that are re-run."""
+    return tuple(shlex.split(command))
+
+
+def _prepare_command(command: Union[str, List[str]], shell: bool) -> Union[str, List[str]]:
+    """Turn a command string into an argument list unless a shell or Windows will parse it."""
+    if isinstance(command, str) and not shell and os.name != 'nt':
+        # shlex keeps quoted arguments like "foo bar" together
+        return list(_split_command(command))
+    # Windows' CreateProcess parses a command string itself
+    return command
+
+
+# Values for ProcessInfo fields that list_processes() wasn't asked to fetch
+_PROCESS_INFO_DEFAULTS = {
+    'name': '', 'status': '', 'username': '', 'create_time': 0.0,
+    'cpu_percent': 0.0, 'memory_percent': 0.0, 'exe': '',
+}
+
+@dataclass(**DATACLASS_SLOTS)
 class ProcessInfo:
     """Process information container."""
     pid: int
@@ -28,8 +108,26 @@ class ProcessInfo:
     environment: Optional[Dict[str, str]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (a shallow copy; nested values are shared)."""
+        return {name: getattr(self, name) for name in _PROCESS_INFO_FIELDS}
+    
+    def get_cwd(self) -> Optional[str]:
+        """Return cwd, reading it from the live process if it wasn't collected."""
+        if self.cwd is None:
+            try:
+                self.cwd = psutil.Process(self.pid).cwd()
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.error(f"Error getting working directory of process {self.pid}: {e}")
+        return self.cwd
+    
+    def get_environment(self) -> Optional[Dict[str, str]]:
+        """Return environment, reading it from the live process if it wasn't collected."""
+        if self.environment is None:
+            try:
+                self.environment = dict(psutil.Process(self.pid).environ())
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.error(f"Error getting environment of process {self.pid}: {e}")
+        return self.environment
     
     def terminate(self, timeout: int = 5) -> bool:
         """Terminate the process."""
@@ -50,6 +148,9 @@ class ProcessInfo:
             return False
 
 
+_PROCESS_INFO_FIELDS = tuple(f.name for f in fields(ProcessInfo))
+
+
 class Process:
     """Wrapper for process operations."""
     
@@ -67,25 +168,48 @@ class Process:
                 raise
         else:
             self._process = psutil.Process()  # Current process
+        
+        # Prime the CPU counter so info reports usage since construction without sleeping
+        try:
+            self._process.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
     
     @property
     def info(self) -> ProcessInfo:
-        """Get process information."""
+        """Get process information (CPU usage since the previous sample)."""
+        return self.get_info()
+    
+    def get_info(self, cpu_interval: Optional[float] = None,
+                 with_environment: bool = False) -> ProcessInfo:
+        """Get process information.
+        
+        cpu_percent covers the time since the previous sample (or since
+        this wrapper was created); pass cpu_interval to block and measure
+        over that many seconds instead. cwd and environment are only read
+        when with_environment is set; otherwise they are left None and
+        ProcessInfo.get_cwd()/get_environment() fetch them on demand.
+        """
         try:
+            if cpu_interval:
+                # Sample before oneshot(), whose cached CPU times would make a timed sample read 0
+                cpu_percent = self._process.cpu_percent(interval=cpu_interval)
             with self._process.oneshot():
+                if not cpu_interval:
+                    cpu_percent = self._process.cpu_percent(interval=None)
                 return ProcessInfo(
                     pid=self._process.pid,
                     name=self._process.name(),
                     status=self._process.status(),
                     username=self._process.username(),
                     create_time=self._process.create_time(),
-                    cpu_percent=self._process.cpu_percent(interval=0.1),
+                    cpu_percent=cpu_percent,
                     memory_percent=self._process.memory_percent(),
                     memory_info=self._process.memory_info()._asdict(),
                     cmdline=self._process.cmdline(),
                     exe=self._process.exe(),
-                    cwd=self._process.cwd() if hasattr(self._process, 'cwd') else None,
-                    environment=dict(self._process.environ()) if hasattr(self._process, 'environ') else None
+                    cwd=self._process.cwd() if with_environment else None,
+                    environment=dict(self._process.environ()) if with_environment else None
                 )
         except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
             self.error_handler.log_error(f"Error getting process info: {e}")
@@ -93,6 +217,9 @@ class Process:
     
     def get_children(self, recursive: bool = False) -> List['Process']:
         """Get child processes."""
+        snapshot_children = getattr(_snapshot_state, 'children', None)
+        if snapshot_children is not None:
+            return self._snapshot_children(snapshot_children, recursive)
         try:
             children = self._process.children(recursive=recursive)
             return [Process(process=child) for child in children]
@@ -100,6 +227,26 @@ class Process:
             self.error_handler.log_error(f"Error getting child processes: {e}")
             return []
     
+    def _snapshot_children(self, children: Dict[int, List[int]], recursive: bool) -> List['Process']:
+        """Resolve child processes from a snapshot() parent/child map."""
+        pids = list(children.get(self._process.pid, ()))
+        if recursive:
+            seen = set(pids)
+            for pid in pids:
+                for child in children.get(pid, ()):
+                    if child not in seen:
+                        seen.add(child)
+                        pids.append(child)
+        
+        result = []
+        for pid in pids:
+            try:
+                result.append(Process(process=psutil.Process(pid)))
+            except psutil.NoSuchProcess:
+                # Exited since the snapshot was taken
+                continue
+        return result
+    
     def get_parent(self) -> Optional['Process']:
         """Get parent process."""
         try:
@@ -182,16 +329,30 @@ class ProcessManager:
     def __init__(self):
         self.error_handler = ErrorHandler()
     
-    def list_processes(self, attrs: Optional[List[str]] = None) -> List[ProcessInfo]:
-        """List all running processes."""
+    snapshot = staticmethod(snapshot)
+    
+    def list_processes(self, attrs: Optional[List[str]] = None,
+                       cpu_interval: Optional[float] = None) -> List[ProcessInfo]:
+        """List all running processes.
+        
+        cpu_percent is measured since the previous listing; pass
+        cpu_interval to sample every process over one shared interval.
+        """
         processes = []
         default_attrs = ['pid', 'name', 'username', 'status', 'cpu_percent', 'memory_percent']
-        attrs = attrs or default_attrs
+        attrs = list(attrs or default_attrs)
+        # Fetched inside process_iter's oneshot() rather than with a second call per process
+        if 'memory_info' not in attrs:
+            attrs.append('memory_info')
+        
+        if cpu_interval and 'cpu_percent' in attrs:
+            self._prime_cpu_percent(cpu_interval)
         
         for proc in psutil.process_iter(attrs=attrs):
             try:
-                process_info = proc.info
-                process_info['memory_info'] = proc.memory_info()._asdict() if hasattr(proc, 'memory_info') else {}
+                process_info = {**_PROCESS_INFO_DEFAULTS, 'cmdline': [], **proc.info}
+                mi = process_info.pop('memory_info', None)
+                process_info['memory_info'] = mi._asdict() if mi else {}
                 processes.append(ProcessInfo(**process_info))
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
                 self.error_handler.log_error(f"Error getting process info: {e}")
@@ -199,16 +360,71 @@ class ProcessManager:
         
         return processes
     
-    def find_processes(self, name: Optional[str] = None, cmdline: Optional[str] = None) -> List[Process]:
-        """Find processes by name or command line."""
+    @staticmethod
+    def _prime_cpu_percent(cpu_interval: float) -> None:
+        """Start a CPU sample on every process, then wait cpu_interval seconds."""
+        # process_iter() reuses its Process objects, so primed counters carry over
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        time.sleep(cpu_interval)
+    
+    def list_processes_columnar(self, cpu_interval: Optional[float] = None) -> Dict[str, Any]:
+        """List all running processes as columns instead of ProcessInfo records.
+        
+        Numeric columns are typed arrays ('pid': int32, 'cpu_percent' and
+        'memory_percent': float64, 'rss': uint64) that numpy can wrap without
+        copying via np.frombuffer(); 'name', 'username' and 'status' are
+        lists of str. Row i of every column describes the same process.
+        """
+        if cpu_interval:
+            self._prime_cpu_percent(cpu_interval)
+        
+        columns: Dict[str, Any] = {
+            'pid': array.array('i'),
+            'cpu_percent': array.array('d'),
+            'memory_percent': array.array('d'),
+            'rss': array.array('Q'),
+            'name': [],
+            'username': [],
+            'status': [],
+        }
+        attrs = ['pid', 'name', 'username', 'status', 'cpu_percent', 'memory_percent', 'memory_info']
+        for proc in psutil.process_iter(attrs=attrs):
+            info = proc.info
+            mi = info['memory_info']
+            columns['pid'].append(info['pid'])
+            columns['cpu_percent'].append(info['cpu_percent'] or 0.0)
+            columns['memory_percent'].append(info['memory_percent'] or 0.0)
+            columns['rss'].append(mi.rss if mi else 0)
+            columns['name'].append(info['name'] or '')
+            columns['username'].append(info['username'] or '')
+            columns['status'].append(info['status'] or '')
+        return columns
+    
+    def find_processes(self, name: Optional[str] = None,
+                       cmdline: Optional[Union[str, Pattern[str]]] = None) -> List[Process]:
+        """Find processes by name or command line.
+        
+        name matches case-insensitively as a substring. cmdline matches as
+        a substring of the space-joined command line, or pass a compiled
+        re.Pattern to search it with a regex.
+        """
         processes = []
+        name_lc = name.lower() if name else None
+        cmdline_re = cmdline if isinstance(cmdline, re.Pattern) else None
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        for proc in _iter_processes(['pid', 'name', 'cmdline']):
             try:
-                if name and name.lower() in proc.info['name'].lower():
-                    processes.append(Process(process=proc))
-                elif cmdline and any(cmdline in ' '.join(cmd) for cmd in proc.info['cmdline'] if cmd):
+                info = proc.info
+                if name_lc and name_lc in (info['name'] or '').lower():
                     processes.append(Process(process=proc))
+                elif cmdline:
+                    joined = ' '.join(info['cmdline'] or ())
+                    if cmdline_re.search(joined) if cmdline_re else cmdline in joined:
+                        processes.append(Process(process=proc))
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
         
@@ -229,8 +445,7 @@ class ProcessManager:
                    timeout: Optional[float] = None) -> subprocess.CompletedProcess:
         """Run a shell command and return the result."""
         try:
-            if isinstance(command, str) and not shell:
-                command = command.split()
+            command = _prepare_command(command, shell)
             
             return subprocess.run(
                 command,
@@ -252,9 +467,10 @@ class ProcessManager:
                       shell: bool = False) -> subprocess.Popen:
         """Create a new process and return the Popen object."""
         try:
-            if isinstance(command, str) and not shell:
-                command = command.split()
+            command = _prepare_command(command, shell)
             
+            # No preexec_fn/user/group switches: CPython 3.10+ can then launch via
+            # vfork, so spawn cost doesn't grow with this process's memory size
             return subprocess.Popen(
                 command,
                 cwd=cwd,
@@ -267,13 +483,26 @@ class ProcessManager:
             self.error_handler.log_error(f"Error creating process: {e}")
             raise
     
-    def terminate_all(self, name: str, signal: int = signal.SIGTERM) -> int:
-        """Terminate all processes with the given name."""
+    def terminate_all(self, name: str, sig: int = signal.SIGTERM, **kwargs: Any) -> int:
+        """Send sig (default SIGTERM) to all processes with the given name.
+        
+        signal= is still accepted, with a DeprecationWarning, as the old name of sig.
+        """
+        if 'signal' in kwargs:
+            warnings.warn("terminate_all(signal=...) is deprecated; use sig=",
+                          DeprecationWarning, stacklevel=2)
+            sig = kwargs.pop('signal')
+        if kwargs:
+            raise TypeError(f"terminate_all() got unexpected keyword arguments: {', '.join(kwargs)}")
         count = 0
         for proc in self.find_processes(name=name):
+            pid = proc._process.pid
             try:
-                proc.send_signal(signal)
+                # One kill() per match; psutil's send_signal would re-check for PID reuse first
+                os.kill(pid, sig)
                 count += 1
-            except Exception as e:
-                self.error_handler.log_error(f"Error terminating process {proc.info.pid}: {e}")
+            except OSError as e:
+                # Exited or protected: ProcessLookupError/PermissionError on
+                # POSIX, a plain OSError (WinError 87 or 5) on Windows
+                self.error_handler.log_error(f"Error terminating process {pid}: {e}")
         return count
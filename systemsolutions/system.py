@@ -5,23 +5,76 @@ System information and monitoring utilities.
 import os
 import sys
 import platform
+import queue
 import psutil
 import socket
-import uuid
+import threading
+import time
+import weakref
 import datetime
-from typing import Dict, List, Optional, Tuple, Union
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from .utils import ErrorHandler, logger
 
+# Seconds the FQDN/IP lookups in SystemInfo.network_info stay cached
+DNS_CACHE_TTL = 60.0
+# Seconds disk_info reuses a mountpoint's usage figures and the partition list
+DISK_USAGE_CACHE_TTL = 0.5
+DISK_PARTITIONS_CACHE_TTL = 5.0
+
+
+def _cpu_busy_total(times) -> Tuple[float, float]:
+    """Busy and total seconds in a psutil cpu_times() entry, counted as cpu_percent() does."""
+    total = sum(times)
+    idle = times.idle
+    if sys.platform.startswith('linux'):
+        # guest time is already included in user/nice; iowait is idle time
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+        idle += getattr(times, 'iowait', 0)
+    return total - idle, total
+
+
+def _cpu_percent_between(before, after) -> float:
+    """CPU usage percentage over the window between two cpu_times() entries."""
+    busy_before, total_before = _cpu_busy_total(before)
+    busy_after, total_after = _cpu_busy_total(after)
+    elapsed = total_after - total_before
+    if elapsed <= 0:
+        return 0.0
+    return round(min(max(100.0 * (busy_after - busy_before) / elapsed, 0.0), 100.0), 1)
+
+
 class SystemInfo:
     """Provides comprehensive system information."""
     
     def __init__(self):
         self.error_handler = ErrorHandler()
+        self._dns_cache: Dict[str, Tuple[float, str]] = {}
+        self._disk_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._partitions_cache: Optional[Tuple[float, List]] = None
+        # Prime psutil's CPU counter so cpu_info can report usage without blocking
+        psutil.cpu_percent(interval=None)
+    
+    def _cached_dns(self, key: str, lookup) -> str:
+        """Return lookup(), reusing its result for DNS_CACHE_TTL seconds."""
+        now = time.monotonic()
+        cached = self._dns_cache.get(key)
+        if cached is not None and now - cached[0] < DNS_CACHE_TTL:
+            return cached[1]
+        value = lookup()
+        self._dns_cache[key] = (now, value)
+        return value
     
     @property
     def platform_info(self) -> Dict[str, str]:
         """Get platform information."""
+        return dict(self._platform_info)
+    
+    @functools.cached_property
+    def _platform_info(self) -> Dict[str, str]:
+        """Platform details, which don't change for the process lifetime; computed once."""
         return {
             'system': platform.system(),
             'node': platform.node(),
@@ -35,22 +88,37 @@ class SystemInfo:
     
     @property
     def cpu_info(self) -> Dict[str, Union[str, int, float]]:
-        """Get CPU information."""
+        """Get CPU information.
+        
+        cpu_percent is the usage since the previous call (or since this
+        object was created; the very first reading may be 0.0). Use
+        sample_cpu() to measure over a fixed window.
+        """
         try:
+            # cpu_freq() reads sysfs for every core, so query it once
+            freq = psutil.cpu_freq() if hasattr(psutil, 'cpu_freq') else None
             return {
                 'physical_cores': psutil.cpu_count(logical=False),
                 'logical_cores': psutil.cpu_count(),
-                'max_frequency': psutil.cpu_freq().max if hasattr(psutil, 'cpu_freq') and psutil.cpu_freq() else None,
-                'min_frequency': psutil.cpu_freq().min if hasattr(psutil, 'cpu_freq') and psutil.cpu_freq() else None,
-                'current_frequency': psutil.cpu_freq().current if hasattr(psutil, 'cpu_freq') and psutil.cpu_freq() else None,
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'cpu_stats': dict(psutil.cpu_stats()._asdict()) if hasattr(psutil, 'cpu_stats') else {},
-                'cpu_times': dict(psutil.cpu_times()._asdict()) if hasattr(psutil, 'cpu_times') else {},
+                'max_frequency': freq.max if freq else None,
+                'min_frequency': freq.min if freq else None,
+                'current_frequency': freq.current if freq else None,
+                'cpu_percent': psutil.cpu_percent(interval=None),
+                'cpu_stats': psutil.cpu_stats()._asdict() if hasattr(psutil, 'cpu_stats') else {},
+                'cpu_times': psutil.cpu_times()._asdict() if hasattr(psutil, 'cpu_times') else {},
             }
         except Exception as e:
             self.error_handler.log_error(f"Error getting CPU info: {e}")
             return {}
     
+    def sample_cpu(self, duration: float = 1.0) -> float:
+        """Measure system-wide CPU usage over the next duration seconds (blocking)."""
+        try:
+            return psutil.cpu_percent(interval=duration)
+        except Exception as e:
+            self.error_handler.log_error(f"Error sampling CPU usage: {e}")
+            return 0.0
+    
     @property
     def memory_info(self) -> Dict[str, Union[int, float]]:
         """Get memory information."""
@@ -74,13 +142,26 @@ class SystemInfo:
     
     @property
     def disk_info(self) -> List[Dict[str, Union[str, int, float]]]:
-        """Get disk/partition information."""
+        """Get disk/partition information.
+        
+        Usage per mountpoint is reused for DISK_USAGE_CACHE_TTL seconds and
+        the partition list for DISK_PARTITIONS_CACHE_TTL, so bursts of
+        callers share one statvfs per mount.
+        """
         try:
+            now = time.monotonic()
+            if self._partitions_cache is None or now - self._partitions_cache[0] >= DISK_PARTITIONS_CACHE_TTL:
+                self._partitions_cache = (now, psutil.disk_partitions())
+            
             disks = []
-            for partition in psutil.disk_partitions():
+            for partition in self._partitions_cache[1]:
+                cached = self._disk_cache.get(partition.mountpoint)
+                if cached is not None and now - cached[0] < DISK_USAGE_CACHE_TTL:
+                    disks.append(dict(cached[1]))
+                    continue
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
-                    disks.append({
+                    disk = {
                         'device': partition.device,
                         'mountpoint': partition.mountpoint,
                         'fstype': partition.fstype,
@@ -89,7 +170,9 @@ class SystemInfo:
                         'used': usage.used,
                         'free': usage.free,
                         'percent': usage.percent,
-                    })
+                    }
+                    self._disk_cache[partition.mountpoint] = (now, disk)
+                    disks.append(dict(disk))
                 except Exception as e:
                     self.error_handler.log_error(f"Error getting disk info for {partition.mountpoint}: {e}")
             return disks
@@ -97,11 +180,18 @@ class SystemInfo:
             self.error_handler.log_error(f"Error getting disk info: {e}")
             return []
     
+    @staticmethod
+    def _primary_ipv4(net_addrs) -> str:
+        """First non-loopback IPv4 address in a net_if_addrs() result, or ''."""
+        return next((a.address for addrs in net_addrs.values() for a in addrs
+                     if a.family == socket.AF_INET and not a.address.startswith('127.')), '')
+    
     @property
     def network_info(self) -> Dict[str, Union[str, List[Dict]]]:
         """Get network information."""
         try:
             net_io = psutil.net_io_counters()
+            hostname = socket.gethostname()
             net_addrs = psutil.net_if_addrs()
             
             interfaces = []
@@ -117,11 +207,14 @@ class SystemInfo:
                 interfaces.append(interface_info)
             
             return {
-                'hostname': socket.gethostname(),
-                'fqdn': socket.getfqdn(),
-                'ip_address': socket.gethostbyname(socket.gethostname()),
-                'mac_address': ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff) 
-                                      for elements in range(5, -1, -1)]),
+                'hostname': hostname,
+                'fqdn': self._cached_dns('fqdn', socket.getfqdn),
+                'ip_address': self._primary_ipv4(net_addrs) or self._cached_dns(
+                    'ip_address', lambda: socket.gethostbyname(hostname)),
+                'mac_address': next(
+                    (a.address.replace('-', ':').lower() for addrs in net_addrs.values() for a in addrs
+                     if a.family == psutil.AF_LINK and a.address and a.address.strip('0:-')),
+                    '00:00:00:00:00:00'),
                 'bytes_sent': net_io.bytes_sent,
                 'bytes_recv': net_io.bytes_recv,
                 'packets_sent': net_io.packets_sent,
@@ -142,16 +235,81 @@ class SystemInfo:
             return ""
     
     def get_all_info(self) -> Dict:
-        """Get all system information in a single dictionary."""
-        return {
-            'platform': self.platform_info,
-            'cpu': self.cpu_info,
-            'memory': self.memory_info,
-            'disks': self.disk_info,
-            'network': self.network_info,
-            'boot_time': self.boot_time,
-            'timestamp': datetime.datetime.now().isoformat(),
+        """Get all system information in a single dictionary.
+        
+        Sections are gathered concurrently; their slow parts (statvfs per
+        mount, DNS lookups, sysfs reads) release the GIL while they wait.
+        """
+        sections = {
+            'platform': lambda: self.platform_info,
+            'cpu': lambda: self.cpu_info,
+            'memory': lambda: self.memory_info,
+            'disks': lambda: self.disk_info,
+            'network': lambda: self.network_info,
+            'boot_time': lambda: self.boot_time,
         }
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {key: executor.submit(fn) for key, fn in sections.items()}
+            info = {key: future.result() for key, future in futures.items()}
+        info['timestamp'] = datetime.datetime.now().isoformat()
+        return info
+
+
+class MonitorHandle:
+    """A monitor running on a background thread.
+    
+    Samples are queued as they are taken; consume them with
+    iter_samples(), or collect everything with results().
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, samples: Callable[[threading.Event], Iterator[Dict]],
+                 callback: Optional[Callable[[Dict], None]] = None,
+                 error_handler: Optional[ErrorHandler] = None):
+        self._stop_event = threading.Event()
+        self._queue: queue.Queue = queue.Queue()
+        self._results: List[Dict] = []
+        self._error_handler = error_handler or ErrorHandler()
+        self._thread = threading.Thread(target=self._run, args=(samples, callback), daemon=True)
+        self._thread.start()
+    
+    def _run(self, samples, callback) -> None:
+        """Thread body: record and queue each sample, then the end marker."""
+        try:
+            for sample in samples(self._stop_event):
+                self._results.append(sample)
+                self._queue.put(sample)
+                if callback:
+                    callback(sample)
+        except Exception as e:
+            self._error_handler.log_error(f"Error in background monitor: {e}")
+        finally:
+            self._queue.put(self._DONE)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the monitor thread is still sampling."""
+        return self._thread.is_alive()
+    
+    def iter_samples(self) -> Iterator[Dict]:
+        """Yield samples as they arrive until the monitor finishes."""
+        while True:
+            sample = self._queue.get()
+            if sample is self._DONE:
+                # Leave the marker for any later iter_samples() call
+                self._queue.put(sample)
+                return
+            yield sample
+    
+    def stop(self) -> None:
+        """Ask the monitor to stop; returns without waiting."""
+        self._stop_event.set()
+    
+    def results(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Wait for the monitor to finish (up to timeout) and return all samples so far."""
+        self._thread.join(timeout)
+        return list(self._results)
 
 
 class SystemMonitor:
@@ -160,95 +318,136 @@ class SystemMonitor:
     def __init__(self, interval: float = 1.0):
         self.interval = interval
         self.error_handler = ErrorHandler()
-        self._stop_event = False
+        # One Event per blocking monitor call, so stop_monitoring() can cut a
+        # pending wait short without a later call clearing it for everyone
+        self._stop_events: Set[threading.Event] = set()
+        self._stop_lock = threading.Lock()
+        # Running handles are kept alive by their threads; finished ones the
+        # caller has dropped fall out of the set on their own
+        self._handles: 'weakref.WeakSet[MonitorHandle]' = weakref.WeakSet()
+    
+    def _cpu_samples(self, duration: float, stop: threading.Event) -> Iterator[Dict]:
+        """Yield CPU usage samples every interval until duration elapses or stop is set."""
+        start_time = time.time()
+        # This generator's own baseline: psutil.cpu_percent(interval=None) shares
+        # one module-level baseline that concurrent monitors would keep resetting
+        last = psutil.cpu_times(percpu=True)
+        while (time.time() - start_time) < duration:
+            if stop.wait(self.interval):
+                return
+            now = psutil.cpu_times(percpu=True)
+            cpu_percent = [_cpu_percent_between(a, b) for a, b in zip(last, now)]
+            last = now
+            yield {
+                'timestamp': datetime.datetime.now().isoformat(),
+                'cpu_percent': cpu_percent,
+                'avg_cpu': sum(cpu_percent) / len(cpu_percent)
+            }
+    
+    def _memory_samples(self, duration: float, stop: threading.Event) -> Iterator[Dict]:
+        """Yield memory usage samples every interval until duration elapses or stop is set."""
+        start_time = time.time()
+        while (time.time() - start_time) < duration and not stop.is_set():
+            mem = psutil.virtual_memory()
+            swap = psutil.swap_memory()
+            yield {
+                'timestamp': datetime.datetime.now().isoformat(),
+                'ram': {
+                    'total': mem.total,
+                    'available': mem.available,
+                    'used': mem.used,
+                    'percent': mem.percent
+                },
+                'swap': {
+                    'total': swap.total,
+                    'used': swap.used,
+                    'free': swap.free,
+                    'percent': swap.percent
+                }
+            }
+            if stop.wait(self.interval):
+                return
+    
+    def _add_stop_event(self) -> threading.Event:
+        """Register a fresh stop Event for one monitor_cpu/monitor_memory call."""
+        stop = threading.Event()
+        with self._stop_lock:
+            self._stop_events.add(stop)
+        return stop
     
     def monitor_cpu(self, duration: int = 10, callback=None) -> List[Dict]:
         """Monitor CPU usage over time."""
-        import time
-        
         results = []
-        start_time = time.time()
+        stop = self._add_stop_event()
         
         try:
-            while (time.time() - start_time) < duration and not self._stop_event:
-                cpu_percent = psutil.cpu_percent(interval=self.interval, percpu=True)
-                timestamp = datetime.datetime.now().isoformat()
-                
-                result = {
-                    'timestamp': timestamp,
-                    'cpu_percent': cpu_percent,
-                    'avg_cpu': sum(cpu_percent) / len(cpu_percent)
-                }
-                
+            for result in self._cpu_samples(duration, stop):
                 results.append(result)
                 if callback:
                     callback(result)
-                
-                if self._stop_event:
-                    break
-                    
         except Exception as e:
             self.error_handler.log_error(f"Error monitoring CPU: {e}")
+        finally:
+            with self._stop_lock:
+                self._stop_events.discard(stop)
         
         return results
     
     def monitor_memory(self, duration: int = 10, callback=None) -> List[Dict]:
         """Monitor memory usage over time."""
-        import time
-        
         results = []
-        start_time = time.time()
+        stop = self._add_stop_event()
         
         try:
-            while (time.time() - start_time) < duration and not self._stop_event:
-                mem = psutil.virtual_memory()
-                swap = psutil.swap_memory()
-                timestamp = datetime.datetime.now().isoformat()
-                
-                result = {
-                    'timestamp': timestamp,
-                    'ram': {
-                        'total': mem.total,
-                        'available': mem.available,
-                        'used': mem.used,
-                        'percent': mem.percent
-                    },
-                    'swap': {
-                        'total': swap.total,
-                        'used': swap.used,
-                        'free': swap.free,
-                        'percent': swap.percent
-                    }
-                }
-                
+            for result in self._memory_samples(duration, stop):
                 results.append(result)
                 if callback:
                     callback(result)
-                
-                time.sleep(self.interval)
-                if self._stop_event:
-                    break
-                    
         except Exception as e:
             self.error_handler.log_error(f"Error monitoring memory: {e}")
+        finally:
+            with self._stop_lock:
+                self._stop_events.discard(stop)
         
         return results
     
+    def _start(self, samples, duration: float, callback) -> MonitorHandle:
+        """Run a sample generator on a MonitorHandle tracked by stop_monitoring()."""
+        handle = MonitorHandle(lambda stop: samples(duration, stop), callback, self.error_handler)
+        self._handles.add(handle)
+        return handle
+    
+    def start_cpu_monitor(self, duration: float = 10, callback=None) -> MonitorHandle:
+        """Start monitor_cpu on a background thread and return its handle immediately."""
+        return self._start(self._cpu_samples, duration, callback)
+    
+    def start_memory_monitor(self, duration: float = 10, callback=None) -> MonitorHandle:
+        """Start monitor_memory on a background thread and return its handle immediately."""
+        return self._start(self._memory_samples, duration, callback)
+    
     def stop_monitoring(self):
-        """Stop any active monitoring."""
-        self._stop_event = True
+        """Stop any active monitoring, including background monitors."""
+        with self._stop_lock:
+            for stop in self._stop_events:
+                stop.set()
+        for handle in list(self._handles):
+            handle.stop()
     
     def get_processes(self, attrs: list = None) -> List[Dict]:
         """Get information about running processes."""
         try:
             processes = []
             default_attrs = ['pid', 'name', 'username', 'status', 'cpu_percent', 'memory_percent']
-            attrs = attrs or default_attrs
+            attrs = list(attrs or default_attrs)
+            # Fetched inside process_iter's oneshot() rather than with a second call per process
+            if 'memory_info' not in attrs:
+                attrs.append('memory_info')
             
             for proc in psutil.process_iter(attrs=attrs):
                 try:
                     process_info = proc.info
-                    process_info['memory_info'] = proc.memory_info()._asdict() if hasattr(proc, 'memory_info') else {}
+                    mi = process_info.pop('memory_info', None)
+                    process_info['memory_info'] = mi._asdict() if mi else {}
                     processes.append(process_info)
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
@@ -3,14 +3,16 @@ Window management and GUI automation utilities.
 """
 
 import ctypes
+import functools
+import operator
+import threading
 import time
 import re
-import pygetwindow as gw
-import pyautogui
-import keyboard
-import pywinauto
-from typing import List, Dict, Optional, Tuple, Union, Any, Callable
-from dataclasses import dataclass
+from collections import OrderedDict
+from ctypes import wintypes
+from typing import List, Dict, Optional, Tuple, Union, Any, Callable, Iterable
+from dataclasses import dataclass, fields
+from ._compat import DATACLASS_SLOTS
 from .utils import ErrorHandler, logger
 
 # Windows API constants
@@ -19,8 +21,414 @@ WM_SYSCOMMAND = 0x0112
 SC_MONITORPOWER = 0xF170
 MONITOR_OFF = 2
 MONITOR_ON = -1
+SMTO_ABORTIFHUNG = 0x0002
+SW_MAXIMIZE = 3
+SW_MINIMIZE = 6
+SW_RESTORE = 9
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_TAB = 0x09
+VK_RETURN = 0x0D
+TOKEN_ADJUST_PRIVILEGES = 0x0020
+TOKEN_QUERY = 0x0008
+SE_PRIVILEGE_ENABLED = 0x00000002
+SE_SHUTDOWN_NAME = 'SeShutdownPrivilege'
+ERROR_NOT_ALL_ASSIGNED = 1300
+SHTDN_REASON_MAJOR_OTHER = 0x00000000
+SHTDN_REASON_FLAG_PLANNED = 0x80000000
 
-@dataclass
+# (button down, button up) MOUSEEVENTF flags
+_MOUSE_BUTTON_FLAGS = {
+    'left': (0x0002, 0x0004),
+    'right': (0x0008, 0x0010),
+    'middle': (0x0020, 0x0040),
+}
+# Characters sent as virtual keys, since most controls ignore them as unicode input
+_VIRTUAL_KEY_CHARS = {'\n': VK_RETURN, '\t': VK_TAB}
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG), ('mouseData', wintypes.DWORD),
+                ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD), ('dwExtraInfo', wintypes.WPARAM)]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [('wVk', wintypes.WORD), ('wScan', wintypes.WORD), ('dwFlags', wintypes.DWORD),
+                ('time', wintypes.DWORD), ('dwExtraInfo', wintypes.WPARAM)]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [('uMsg', wintypes.DWORD), ('wParamL', wintypes.WORD), ('wParamH', wintypes.WORD)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('mi', _MOUSEINPUT), ('ki', _KEYBDINPUT), ('hi', _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+
+
+class _LUID(ctypes.Structure):
+    _fields_ = [('LowPart', wintypes.DWORD), ('HighPart', wintypes.LONG)]
+
+
+class _LUID_AND_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [('Luid', _LUID), ('Attributes', wintypes.DWORD)]
+
+
+class _TOKEN_PRIVILEGES(ctypes.Structure):
+    _fields_ = [('PrivilegeCount', wintypes.DWORD), ('Privileges', _LUID_AND_ATTRIBUTES * 1)]
+
+# EnumWindows callback type (WINFUNCTYPE only exists on Windows builds of ctypes)
+_WNDENUMPROC = getattr(ctypes, 'WINFUNCTYPE', ctypes.CFUNCTYPE)(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+# user32 prototypes: typed calls skip ctypes' per-call argument guessing
+_USER32_PROTOTYPES = {
+    'EnumWindows': (wintypes.BOOL, [_WNDENUMPROC, wintypes.LPARAM]),
+    'GetForegroundWindow': (wintypes.HWND, []),
+    'GetWindowTextLengthW': (ctypes.c_int, [wintypes.HWND]),
+    'GetWindowTextW': (ctypes.c_int, [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]),
+    'GetWindowThreadProcessId': (wintypes.DWORD, [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]),
+    'IsWindowVisible': (wintypes.BOOL, [wintypes.HWND]),
+    'IsIconic': (wintypes.BOOL, [wintypes.HWND]),
+    'IsZoomed': (wintypes.BOOL, [wintypes.HWND]),
+    'GetClassNameW': (ctypes.c_int, [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]),
+    'GetWindowRect': (wintypes.BOOL, [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]),
+    'SetForegroundWindow': (wintypes.BOOL, [wintypes.HWND]),
+    'ShowWindow': (wintypes.BOOL, [wintypes.HWND, ctypes.c_int]),
+    'MoveWindow': (wintypes.BOOL, [wintypes.HWND, ctypes.c_int, ctypes.c_int,
+                                   ctypes.c_int, ctypes.c_int, wintypes.BOOL]),
+    'SetWindowTextW': (wintypes.BOOL, [wintypes.HWND, wintypes.LPCWSTR]),
+    'SetWindowPos': (wintypes.BOOL, [wintypes.HWND, wintypes.HWND, ctypes.c_int, ctypes.c_int,
+                                     ctypes.c_int, ctypes.c_int, wintypes.UINT]),
+    'BeginDeferWindowPos': (wintypes.HANDLE, [ctypes.c_int]),
+    'DeferWindowPos': (wintypes.HANDLE, [wintypes.HANDLE, wintypes.HWND, wintypes.HWND, ctypes.c_int,
+                                         ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT]),
+    'EndDeferWindowPos': (wintypes.BOOL, [wintypes.HANDLE]),
+    'GetSystemMetrics': (ctypes.c_int, [ctypes.c_int]),
+    'GetCursorPos': (wintypes.BOOL, [ctypes.POINTER(wintypes.POINT)]),
+    'SetCursorPos': (wintypes.BOOL, [ctypes.c_int, ctypes.c_int]),
+    'PostMessageW': (wintypes.BOOL, [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]),
+    'SendMessageW': (wintypes.LPARAM, [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]),
+    'SendMessageTimeoutW': (wintypes.LPARAM, [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+                                              wintypes.UINT, wintypes.UINT, ctypes.POINTER(wintypes.WPARAM)]),
+    'SendInput': (wintypes.UINT, [wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int]),
+    'SetProcessDPIAware': (wintypes.BOOL, []),
+    'LockWorkStation': (wintypes.BOOL, []),
+    'ExitWindowsEx': (wintypes.BOOL, [wintypes.UINT, wintypes.DWORD]),
+}
+
+# advapi32/kernel32 prototypes for shutting down without spawning shutdown.exe
+_ADVAPI32_PROTOTYPES = {
+    'OpenProcessToken': (wintypes.BOOL, [wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)]),
+    'LookupPrivilegeValueW': (wintypes.BOOL, [wintypes.LPCWSTR, wintypes.LPCWSTR,
+                                              ctypes.POINTER(_LUID)]),
+    'AdjustTokenPrivileges': (wintypes.BOOL, [wintypes.HANDLE, wintypes.BOOL, ctypes.POINTER(_TOKEN_PRIVILEGES),
+                                              wintypes.DWORD, ctypes.c_void_p, ctypes.c_void_p]),
+    'InitiateSystemShutdownExW': (wintypes.BOOL, [wintypes.LPWSTR, wintypes.LPWSTR, wintypes.DWORD,
+                                                  wintypes.BOOL, wintypes.BOOL, wintypes.DWORD]),
+}
+_KERNEL32_PROTOTYPES = {
+    'GetCurrentProcess': (wintypes.HANDLE, []),
+    'CloseHandle': (wintypes.BOOL, [wintypes.HANDLE]),
+}
+
+
+def _typed_dll(name: str, prototypes: Dict[str, Tuple[Any, List[Any]]]):
+    """Load a private handle to a DLL and apply prototypes to it."""
+    dll = ctypes.WinDLL(name, use_last_error=True)
+    for func_name, (restype, argtypes) in prototypes.items():
+        func = getattr(dll, func_name)
+        func.restype = restype
+        func.argtypes = argtypes
+    return dll
+
+
+@functools.lru_cache(maxsize=1)
+def _load_user32():
+    """Load a private user32 handle with typed prototypes.
+    
+    A separate WinDLL instance keeps these prototypes from leaking into
+    ctypes.windll.user32, which pyautogui also calls.
+    """
+    return _typed_dll('user32', _USER32_PROTOTYPES)
+
+
+@functools.lru_cache(maxsize=1)
+def _enable_shutdown_privilege():
+    """Enable SeShutdownPrivilege for this process and return the typed advapi32 handle.
+    
+    Runs once per process; failures are not cached, so a later call retries.
+    """
+    advapi32 = _typed_dll('advapi32', _ADVAPI32_PROTOTYPES)
+    kernel32 = _typed_dll('kernel32', _KERNEL32_PROTOTYPES)
+    token = wintypes.HANDLE()
+    if not advapi32.OpenProcessToken(kernel32.GetCurrentProcess(),
+                                     TOKEN_ADJUST_PRIVILEGES | TOKEN_QUERY, ctypes.byref(token)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        privileges = _TOKEN_PRIVILEGES(PrivilegeCount=1)
+        privileges.Privileges[0].Attributes = SE_PRIVILEGE_ENABLED
+        if not advapi32.LookupPrivilegeValueW(None, SE_SHUTDOWN_NAME,
+                                              ctypes.byref(privileges.Privileges[0].Luid)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        # Succeeds even when the privilege is not held; that shows up in the last error
+        ok = advapi32.AdjustTokenPrivileges(token, False, ctypes.byref(privileges), 0, None, None)
+        error = ctypes.get_last_error()
+        if not ok or error == ERROR_NOT_ALL_ASSIGNED:
+            raise ctypes.WinError(error)
+    finally:
+        kernel32.CloseHandle(token)
+    return advapi32
+
+
+# Per-thread out-parameter structs; callers copy the fields out before returning
+_scratch = threading.local()
+
+
+def _scratch_struct(name: str, struct_type: type):
+    """Return this thread's reusable instance of a ctypes out-parameter type."""
+    value = getattr(_scratch, name, None)
+    if value is None:
+        value = struct_type()
+        setattr(_scratch, name, value)
+    return value
+
+
+def _scratch_text_buffer(size: int) -> ctypes.Array:
+    """Return this thread's reusable unicode buffer, grown to hold at least size characters."""
+    buffer = getattr(_scratch, 'text', None)
+    if buffer is None or len(buffer) < size:
+        buffer = ctypes.create_unicode_buffer(max(size, 256))
+        _scratch.text = buffer
+    return buffer
+
+
+# Class names by (HWND, PID): Windows reuses HWND values once a window is
+# destroyed, and the owning PID tells a recycled handle apart
+CLASS_NAME_CACHE_SIZE = 1024
+_class_names: 'OrderedDict[Tuple[int, int], str]' = OrderedDict()
+_class_names_lock = threading.Lock()
+
+
+def _window_class_name(hwnd: int, process_id: Optional[int] = None) -> str:
+    """Return a window's class name; it never changes for the window's lifetime."""
+    user32 = _load_user32()
+    if process_id is None:
+        pid = _scratch_struct('pid', wintypes.DWORD)
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        process_id = pid.value
+    key = (hwnd, process_id)
+    with _class_names_lock:
+        name = _class_names.get(key)
+        if name is not None:
+            _class_names.move_to_end(key)
+            return name
+    
+    buffer = _scratch_text_buffer(256)
+    if not user32.GetClassNameW(hwnd, buffer, 256):
+        # Failed (e.g. the window just closed); don't remember the empty result
+        return ''
+    name = buffer.value
+    with _class_names_lock:
+        _class_names[key] = name
+        if len(_class_names) > CLASS_NAME_CACHE_SIZE:
+            _class_names.popitem(last=False)
+    return name
+
+
+def _visible_windows() -> List[int]:
+    """Handles of all visible top-level windows, in z-order, from one EnumWindows pass."""
+    user32 = _load_user32()
+    hwnds: List[int] = []
+    
+    def collect(hwnd, _):
+        if user32.IsWindowVisible(hwnd):
+            hwnds.append(hwnd)
+        return True
+    
+    user32.EnumWindows(_WNDENUMPROC(collect), 0)
+    return hwnds
+
+
+# Characters that make a filter a regex rather than a plain substring
+_REGEX_METACHARS = re.compile(r'[.*+?^$()\[\]{}|\\]')
+
+
+def _compile_filter(pattern: str) -> Callable[[str], bool]:
+    """Build a case-insensitive matcher for a get_windows() filter.
+    
+    Plain text is matched with a substring test; anything containing regex
+    metacharacters is compiled and searched as before.
+    """
+    if _REGEX_METACHARS.search(pattern):
+        return re.compile(pattern, re.IGNORECASE).search
+    needle = pattern.lower()
+    return lambda text: needle in text.lower()
+
+
+# Names of the values _query_window() returns, in order
+_QUERY_WINDOW_FIELDS = ('title', 'is_visible', 'is_minimized', 'is_maximized',
+                        'x', 'y', 'width', 'height', 'process_id')
+
+
+def _query_window(hwnd: int) -> Tuple[str, bool, bool, bool, int, int, int, int, int]:
+    """Read a window's state in one go.
+    
+    Returns (title, is_visible, is_minimized, is_maximized, x, y, width,
+    height, process_id).
+    """
+    user32 = _load_user32()
+    length = user32.GetWindowTextLengthW(hwnd)
+    buffer = _scratch_text_buffer(length + 1)
+    user32.GetWindowTextW(hwnd, buffer, length + 1)
+    rect = _scratch_struct('rect', wintypes.RECT)
+    user32.GetWindowRect(hwnd, ctypes.byref(rect))
+    pid = _scratch_struct('pid', wintypes.DWORD)
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return (buffer.value, bool(user32.IsWindowVisible(hwnd)), bool(user32.IsIconic(hwnd)),
+            bool(user32.IsZoomed(hwnd)), rect.left, rect.top,
+            rect.right - rect.left, rect.bottom - rect.top, pid.value)
+
+
+def _key_inputs(text: str) -> ctypes.Array:
+    """Build key down/up INPUT events that type text."""
+    events = []
+    for char in text:
+        vk = _VIRTUAL_KEY_CHARS.get(char)
+        if vk is not None:
+            events.append((vk, 0, 0))
+            events.append((vk, 0, KEYEVENTF_KEYUP))
+            continue
+        # Characters outside the BMP are sent as their two UTF-16 surrogates
+        encoded = char.encode('utf-16-le')
+        for i in range(0, len(encoded), 2):
+            unit = int.from_bytes(encoded[i:i + 2], 'little')
+            events.append((0, unit, KEYEVENTF_UNICODE))
+            events.append((0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    
+    inputs = (_INPUT * len(events))()
+    for item, (vk, scan, flags) in zip(inputs, events):
+        item.type = INPUT_KEYBOARD
+        item.u.ki.wVk = vk
+        item.u.ki.wScan = scan
+        item.u.ki.dwFlags = flags
+    return inputs
+
+
+def _click_inputs(button: str, clicks: int) -> ctypes.Array:
+    """Build mouse down/up INPUT events for clicks at the current cursor position."""
+    try:
+        down, up = _MOUSE_BUTTON_FLAGS[button]
+    except KeyError:
+        raise ValueError(f"Unknown mouse button: {button}")
+    inputs = (_INPUT * (2 * clicks))()
+    for i, item in enumerate(inputs):
+        item.type = INPUT_MOUSE
+        item.u.mi.dwFlags = up if i % 2 else down
+    return inputs
+
+
+@functools.lru_cache(maxsize=1)
+def _primary_screen_size() -> Tuple[int, int]:
+    """Primary screen resolution, read once until WindowManager.invalidate_screen_size()."""
+    user32 = _load_user32()
+    return (user32.GetSystemMetrics(0),  # SM_CXSCREEN
+            user32.GetSystemMetrics(1))  # SM_CYSCREEN
+
+
+# Seconds a PID -> process name lookup is reused; short enough that PID reuse is not a concern
+PROCESS_NAME_CACHE_TTL = 5.0
+# Seconds find_window() reuses the last window enumeration
+WINDOW_CACHE_TTL = 0.1
+# Milliseconds set_display_state() waits on each window before moving on
+DISPLAY_STATE_TIMEOUT_MS = 1000
+
+# Most PIDs whose names are remembered at once
+PROCESS_NAME_CACHE_SIZE = 1024
+
+# PID -> (lookup time, process name), shared by all WindowManager instances;
+# kept oldest-first so expired entries can be dropped from the front
+_process_names: 'OrderedDict[int, Tuple[float, str]]' = OrderedDict()
+_process_names_lock = threading.Lock()
+
+
+def _cached_process_name(process_id: int, now: float) -> Optional[str]:
+    """Return a cached name younger than PROCESS_NAME_CACHE_TTL, or None."""
+    with _process_names_lock:
+        cached = _process_names.get(process_id)
+    if cached is not None and now - cached[0] < PROCESS_NAME_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _remember_process_names(names: Dict[int, str], now: float) -> None:
+    """Cache looked-up names, dropping expired entries and the oldest beyond the size cap."""
+    with _process_names_lock:
+        for pid, name in names.items():
+            _process_names[pid] = (now, name)
+            _process_names.move_to_end(pid)
+        while _process_names:
+            pid, (looked_up, _) = next(iter(_process_names.items()))
+            if now - looked_up < PROCESS_NAME_CACHE_TTL and len(_process_names) <= PROCESS_NAME_CACHE_SIZE:
+                break
+            del _process_names[pid]
+
+
+def _process_name(process_id: int) -> str:
+    """Get the name of the process by ID (cached for PROCESS_NAME_CACHE_TTL seconds)."""
+    now = time.monotonic()
+    cached = _cached_process_name(process_id, now)
+    if cached is not None:
+        return cached
+    
+    try:
+        import psutil
+        name = psutil.Process(process_id).name()
+    except ImportError:
+        return ''
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        name = ''
+    _remember_process_names({process_id: name}, now)
+    return name
+
+
+def _resolve_process_names(process_ids: Iterable[int]) -> Dict[int, str]:
+    """Look up several process names, walking the process list once for the uncached ones."""
+    now = time.monotonic()
+    names: Dict[int, str] = {}
+    missing = set()
+    for pid in process_ids:
+        cached = _cached_process_name(pid, now)
+        if cached is not None:
+            names[pid] = cached
+        else:
+            missing.add(pid)
+    if len(missing) <= 1:
+        # A single psutil.Process() is cheaper than a full process_iter() pass
+        names.update((pid, _process_name(pid)) for pid in missing)
+        return names
+    
+    try:
+        import psutil
+    except ImportError:
+        names.update(dict.fromkeys(missing, ''))
+        return names
+    for proc in psutil.process_iter(['pid', 'name']):
+        pid = proc.info['pid']
+        if pid in missing:
+            names[pid] = proc.info['name'] or ''
+    # Processes that exited (or hid) get cached as '' too, like _process_name()
+    _remember_process_names({pid: names.setdefault(pid, '') for pid in missing}, now)
+    return names
+
+
+@dataclass(**DATACLASS_SLOTS)
 class WindowInfo:
     """Window information container."""
     handle: int
@@ -35,134 +443,238 @@ class WindowInfo:
     width: int
     height: int
     process_id: int
-    process_name: str
+    process_name: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            'handle': self.handle,
-            'title': self.title,
-            'class_name': self.class_name,
-            'is_active': self.is_active,
-            'is_visible': self.is_visible,
-            'is_minimized': self.is_minimized,
-            'is_maximized': self.is_maximized,
-            'x': self.x,
-            'y': self.y,
-            'width': self.width,
-            'height': self.height,
-            'process_id': self.process_id,
-            'process_name': self.process_name
-        }
+        return {name: getattr(self, name) for name in _WINDOW_INFO_FIELDS}
+    
+    def get_process_name(self) -> str:
+        """Return process_name, looking it up from process_id if it wasn't collected."""
+        if self.process_name is None:
+            self.process_name = _process_name(self.process_id)
+        return self.process_name
+    
+    @staticmethod
+    def to_dict_many(windows: List['WindowInfo']) -> List[Dict[str, Any]]:
+        """Convert several windows to dictionaries, reading all fields of each in one call."""
+        return [dict(zip(_WINDOW_INFO_FIELDS, values)) for values in map(_window_info_values, windows)]
+
+
+_WINDOW_INFO_FIELDS = tuple(f.name for f in fields(WindowInfo))
+_window_info_values = operator.attrgetter(*_WINDOW_INFO_FIELDS)
+
 
 class WindowManager:
     """Manages windows and GUI automation."""
     
     def __init__(self):
         self.error_handler = ErrorHandler()
-        self.user32 = ctypes.windll.user32
-        self._setup_pyautogui()
+        self.user32 = _load_user32()
+        # Windows from the last enumeration in z-order, their casefolded titles,
+        # and casefolded title -> position of its topmost window
+        self._window_cache: List[WindowInfo] = []
+        self._folded_titles: List[str] = []
+        self._title_index: Dict[str, int] = {}
+        self._window_cache_ts = 0.0
+        self._pyautogui = None
+        # pyautogui makes the process DPI aware on import; do it up front so
+        # window coordinates stay the same before and after it is loaded
+        self.user32.SetProcessDPIAware()
     
     def _setup_pyautogui(self):
-        """Configure PyAutoGUI settings."""
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1
+        """Import and configure PyAutoGUI on first use; it is slow to import."""
+        if self._pyautogui is None:
+            import pyautogui
+            pyautogui.FAILSAFE = True
+            pyautogui.PAUSE = 0.1
+            self._pyautogui = pyautogui
+        return self._pyautogui
     
     # ========== Window Information ==========
     
     def get_active_window(self) -> Optional[WindowInfo]:
         """Get the currently active window."""
         try:
-            window = gw.getActiveWindow()
-            if window:
-                return self._pyw_to_window_info(window)
-            return None
+            hwnd = self.user32.GetForegroundWindow()
+            if not hwnd:
+                return None
+            return self._hwnd_to_window_info(hwnd, is_active=True)
         except Exception as e:
             self.error_handler.log_error(f"Error getting active window: {e}")
             return None
     
     def get_windows(self, title: Optional[str] = None, 
                    class_name: Optional[str] = None, 
-                   process_id: Optional[int] = None) -> List[WindowInfo]:
-        """Get a list of all windows matching the criteria."""
+                   process_id: Optional[int] = None,
+                   with_process_name: bool = False) -> List[WindowInfo]:
+        """Get a list of all windows matching the criteria.
+        
+        process_name is left as None unless with_process_name is set, since
+        it costs a process lookup per window; WindowInfo.get_process_name()
+        fetches it on demand.
+        """
         try:
-            windows = gw.getAllWindows()
+            # Build the filters once rather than per window
+            title_match = _compile_filter(title) if title else None
+            class_match = _compile_filter(class_name) if class_name else None
+            
+            foreground = self.user32.GetForegroundWindow()
             results = []
             
-            for window in windows:
-                if not window.visible:
+            # Read each window's Win32 state directly rather than through
+            # pygetwindow objects, which issue a separate call per attribute
+            for hwnd in _visible_windows():
+                (window_title, is_visible, is_minimized, is_maximized,
+                 x, y, width, height, pid) = _query_window(hwnd)
+                
+                if title_match and not title_match(window_title):
                     continue
-                    
-                if title and not re.search(title, window.title, re.IGNORECASE):
+                
+                if process_id and pid != process_id:
                     continue
-                    
-                if class_name and hasattr(window, '_hWnd'):
-                    buffer = ctypes.create_unicode_buffer(256)
-                    self.user32.GetClassNameW(window._hWnd, buffer, 256)
-                    if not re.search(class_name, buffer.value, re.IGNORECASE):
-                        continue
                 
-                if process_id and hasattr(window, '_processId'):
-                    if window._processId != process_id:
-                        continue
+                window_class = _window_class_name(hwnd, pid)
+                if class_match and not class_match(window_class):
+                    continue
                 
-                results.append(self._pyw_to_window_info(window))
+                results.append(WindowInfo(
+                    handle=hwnd,
+                    title=window_title,
+                    class_name=window_class,
+                    is_active=hwnd == foreground,
+                    is_visible=is_visible,
+                    is_minimized=is_minimized,
+                    is_maximized=is_maximized,
+                    x=x,
+                    y=y,
+                    width=width,
+                    height=height,
+                    process_id=pid
+                ))
+            
+            if with_process_name:
+                names = _resolve_process_names({w.process_id for w in results})
+                for window in results:
+                    window.process_name = names[window.process_id]
             
             return results
         except Exception as e:
             self.error_handler.log_error(f"Error getting windows: {e}")
             return []
     
-    def find_window(self, title: str) -> Optional[WindowInfo]:
-        """Find a window by title."""
+    def get_windows_columnar(self, fields: Iterable[str]) -> Dict[str, list]:
+        """List visible windows as columns, computing only the requested fields.
+        
+        fields are WindowInfo field names. class_name and process_name are
+        only looked up when requested, so e.g. ['handle', 'title'] costs no
+        psutil calls. Row i of every column describes the same window.
+        """
         try:
-            window = gw.getWindowsWithTitle(title)
-            if window:
-                return self._pyw_to_window_info(window[0])
-            return None
+            wanted = list(dict.fromkeys(fields))
+            unknown = set(wanted).difference(_WINDOW_INFO_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown window fields: {sorted(unknown)}")
+            
+            columns: Dict[str, list] = {name: [] for name in wanted}
+            need_query = 'process_name' in columns or any(name in columns for name in _QUERY_WINDOW_FIELDS)
+            foreground = self.user32.GetForegroundWindow() if 'is_active' in columns else None
+            
+            for hwnd in _visible_windows():
+                row = dict(zip(_QUERY_WINDOW_FIELDS, _query_window(hwnd))) if need_query else {}
+                for name, column in columns.items():
+                    if name == 'handle':
+                        column.append(hwnd)
+                    elif name == 'is_active':
+                        column.append(hwnd == foreground)
+                    elif name == 'class_name':
+                        column.append(self._get_window_class_name(hwnd, row.get('process_id')))
+                    elif name == 'process_name':
+                        # Filled in below from one batched lookup
+                        column.append(row['process_id'])
+                    else:
+                        column.append(row[name])
+            
+            if 'process_name' in columns:
+                pids = columns['process_name']
+                names = _resolve_process_names(set(pids))
+                columns['process_name'] = [names[pid] for pid in pids]
+            
+            return columns
         except Exception as e:
-            self.error_handler.log_error(f"Error finding window '{title}': {e}")
-            return None
+            self.error_handler.log_error(f"Error getting window columns: {e}")
+            return {}
+    
+    def _cached_windows(self) -> List[WindowInfo]:
+        """Return the windows in z-order, re-enumerating once WINDOW_CACHE_TTL has passed."""
+        now = time.monotonic()
+        if now - self._window_cache_ts >= WINDOW_CACHE_TTL:
+            self._window_cache = self.get_windows()
+            self._folded_titles = [w.title.casefold() for w in self._window_cache]
+            self._title_index = {}
+            for position, folded in enumerate(self._folded_titles):
+                # Keep the topmost window for each title
+                self._title_index.setdefault(folded, position)
+            self._window_cache_ts = now
+        return self._window_cache
+    
+    def invalidate_window_cache(self) -> None:
+        """Drop the cached window list so the next lookup re-enumerates."""
+        self._window_cache_ts = 0.0
+    
+    def invalidate_screen_size(self) -> None:
+        """Forget the memoized screen size, e.g. after a display resolution change."""
+        _primary_screen_size.cache_clear()
     
-    def _pyw_to_window_info(self, window) -> WindowInfo:
-        """Convert PyGetWindow window to WindowInfo."""
+    def find_window(self, title: str) -> Optional[WindowInfo]:
+        """Find a window by title (the topmost window whose title contains it, ignoring case).
+        
+        Lookups within WINDOW_CACHE_TTL seconds of each other share one
+        enumeration. An exact title match bounds the search, so only the
+        windows above it need a substring check.
+        """
         try:
-            return WindowInfo(
-                handle=window._hWnd if hasattr(window, '_hWnd') else 0,
-                title=window.title,
-                class_name=self._get_window_class_name(window._hWnd) if hasattr(window, '_hWnd') else '',
-                is_active=window.isActive,
-                is_visible=window.visible,
-                is_minimized=window.isMinimized,
-                is_maximized=window.isMaximized,
-                x=window.left,
-                y=window.top,
-                width=window.width,
-                height=window.height,
-                process_id=window._processId if hasattr(window, '_processId') else 0,
-                process_name=self._get_process_name(window._processId) if hasattr(window, '_processId') else ''
-            )
+            windows = self._cached_windows()
+            needle = title.casefold()
+            exact = self._title_index.get(needle, len(windows))
+            for position in range(exact):
+                if needle in self._folded_titles[position]:
+                    return windows[position]
+            return windows[exact] if exact < len(windows) else None
         except Exception as e:
-            self.error_handler.log_error(f"Error converting window info: {e}")
-            return WindowInfo(0, '', '', False, False, False, False, 0, 0, 0, 0, 0, '')
+            self.error_handler.log_error(f"Error finding window '{title}': {e}")
+            return None
     
-    def _get_window_class_name(self, hwnd: int) -> str:
+    def _hwnd_to_window_info(self, hwnd: int, is_active: bool) -> WindowInfo:
+        """Build a WindowInfo straight from a window handle."""
+        (title, is_visible, is_minimized, is_maximized,
+         x, y, width, height, pid) = _query_window(hwnd)
+        return WindowInfo(
+            handle=hwnd,
+            title=title,
+            class_name=self._get_window_class_name(hwnd, pid),
+            is_active=is_active,
+            is_visible=is_visible,
+            is_minimized=is_minimized,
+            is_maximized=is_maximized,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            process_id=pid,
+            process_name=self._get_process_name(pid)
+        )
+    
+    def _get_window_class_name(self, hwnd: int, process_id: Optional[int] = None) -> str:
         """Get the window class name."""
         try:
-            buffer = ctypes.create_unicode_buffer(256)
-            self.user32.GetClassNameW(hwnd, buffer, 256)
-            return buffer.value
+            return _window_class_name(hwnd, process_id)
         except Exception:
             return ''
     
     def _get_process_name(self, process_id: int) -> str:
         """Get the name of the process by ID."""
-        try:
-            import psutil
-            process = psutil.Process(process_id)
-            return process.name()
-        except (psutil.NoSuchProcess, psutil.AccessDenied, ImportError):
-            return ''
+        return _process_name(process_id)
     
     # ========== Window Control ==========
     
@@ -170,9 +682,10 @@ class WindowManager:
         """Activate a window."""
         try:
             if window_info.is_minimized:
-                self.user32.ShowWindow(window_info.handle, 9)  # SW_RESTORE = 9
+                self.user32.ShowWindow(window_info.handle, SW_RESTORE)
             
             self.user32.SetForegroundWindow(window_info.handle)
+            self.invalidate_window_cache()
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error activating window: {e}")
@@ -182,61 +695,87 @@ class WindowManager:
         """Close a window."""
         try:
             self.user32.PostMessageW(window_info.handle, 0x0010, 0, 0)  # WM_CLOSE
+            self.invalidate_window_cache()
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error closing window: {e}")
             return False
     
-    def minimize_window(self, window_info: WindowInfo) -> bool:
-        """Minimize a window."""
+    def _show_window(self, window_info: WindowInfo, command: int, action: str) -> bool:
+        """Apply a ShowWindow SW_* command, logging failures as 'Error <action> window'."""
         try:
-            self.user32.ShowWindow(window_info.handle, 6)  # SW_MINIMIZE = 6
+            # ShowWindow returns the previous visibility, not success
+            self.user32.ShowWindow(window_info.handle, command)
+            self.invalidate_window_cache()
             return True
         except Exception as e:
-            self.error_handler.log_error(f"Error minimizing window: {e}")
+            self.error_handler.log_error(f"Error {action} window: {e}")
             return False
     
+    def minimize_window(self, window_info: WindowInfo) -> bool:
+        """Minimize a window."""
+        return self._show_window(window_info, SW_MINIMIZE, 'minimizing')
+    
     def maximize_window(self, window_info: WindowInfo) -> bool:
         """Maximize a window."""
-        try:
-            self.user32.ShowWindow(window_info.handle, 3)  # SW_MAXIMIZE = 3
-            return True
-        except Exception as e:
-            self.error_handler.log_error(f"Error maximizing window: {e}")
-            return False
+        return self._show_window(window_info, SW_MAXIMIZE, 'maximizing')
     
     def restore_window(self, window_info: WindowInfo) -> bool:
         """Restore a window from minimized or maximized state."""
-        try:
-            self.user32.ShowWindow(window_info.handle, 9)  # SW_RESTORE = 9
-            return True
-        except Exception as e:
-            self.error_handler.log_error(f"Error restoring window: {e}")
-            return False
+        return self._show_window(window_info, SW_RESTORE, 'restoring')
     
     def move_window(self, window_info: WindowInfo, x: int, y: int, 
                    width: Optional[int] = None, 
                    height: Optional[int] = None) -> bool:
-        """Move and/or resize a window."""
+        """Move and/or resize a window.
+        
+        A width or height left as None keeps the size recorded in window_info.
+        """
         try:
-            if width is None or height is None:
-                rect = ctypes.wintypes.RECT()
-                self.user32.GetWindowRect(window_info.handle, ctypes.byref(rect))
-                if width is None:
-                    width = rect.right - rect.left
-                if height is None:
-                    height = rect.bottom - rect.top
+            if width is None:
+                width = window_info.width
+            if height is None:
+                height = window_info.height
             
             self.user32.MoveWindow(window_info.handle, x, y, width, height, True)
+            self.invalidate_window_cache()
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error moving/resizing window: {e}")
             return False
     
+    def move_windows_batch(self, ops: List[Tuple[WindowInfo, int, int, int, int]]) -> List[bool]:
+        """Move and resize several windows at once.
+        
+        Each op is (window_info, x, y, width, height). The moves are queued
+        with DeferWindowPos and applied together by EndDeferWindowPos, so the
+        windows are repositioned and repainted in a single pass. If the batch
+        cannot be built, each window is moved individually instead.
+        """
+        if not ops:
+            return []
+        try:
+            hdwp = self.user32.BeginDeferWindowPos(len(ops))
+            for window_info, x, y, width, height in ops:
+                if not hdwp:
+                    break
+                # A failed DeferWindowPos frees the batch and returns NULL
+                hdwp = self.user32.DeferWindowPos(hdwp, window_info.handle, None, x, y, width, height,
+                                                  SWP_NOZORDER | SWP_NOACTIVATE)
+            if hdwp and self.user32.EndDeferWindowPos(hdwp):
+                self.invalidate_window_cache()
+                return [True] * len(ops)
+        except Exception as e:
+            self.error_handler.log_error(f"Error batching window moves: {e}")
+        
+        return [self.move_window(window_info, x, y, width, height)
+                for window_info, x, y, width, height in ops]
+    
     def set_window_title(self, window_info: WindowInfo, title: str) -> bool:
         """Set window title."""
         try:
             self.user32.SetWindowTextW(window_info.handle, title)
+            self.invalidate_window_cache()
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error setting window title: {e}")
@@ -263,8 +802,7 @@ class WindowManager:
     def get_screen_size(self) -> Tuple[int, int]:
         """Get the primary screen resolution."""
         try:
-            return (self.user32.GetSystemMetrics(0),  # SM_CXSCREEN
-                   self.user32.GetSystemMetrics(1))   # SM_CYSCREEN
+            return _primary_screen_size()
         except Exception as e:
             self.error_handler.log_error(f"Error getting screen size: {e}")
             return (0, 0)
@@ -272,7 +810,7 @@ class WindowManager:
     def get_cursor_position(self) -> Tuple[int, int]:
         """Get the current cursor position."""
         try:
-            point = ctypes.wintypes.POINT()
+            point = _scratch_struct('point', wintypes.POINT)
             self.user32.GetCursorPos(ctypes.byref(point))
             return (point.x, point.y)
         except Exception as e:
@@ -288,6 +826,14 @@ class WindowManager:
             self.error_handler.log_error(f"Error setting cursor position: {e}")
             return False
     
+    def _send_input(self, inputs: ctypes.Array) -> None:
+        """Inject INPUT events, raising if Windows rejects any of them."""
+        if not inputs:
+            return
+        sent = self.user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+        if sent != len(inputs):
+            raise ctypes.WinError(ctypes.get_last_error())
+    
     def click(self, x: Optional[int] = None, y: Optional[int] = None, 
              button: str = 'left', clicks: int = 1, interval: float = 0.1) -> bool:
         """Perform a mouse click."""
@@ -295,7 +841,14 @@ class WindowManager:
             if x is not None and y is not None:
                 self.set_cursor_position(x, y)
             
-            pyautogui.click(button=button, clicks=clicks, interval=interval)
+            if interval > 0 and clicks > 1:
+                single = _click_inputs(button, 1)
+                for i in range(clicks):
+                    if i:
+                        time.sleep(interval)
+                    self._send_input(single)
+            else:
+                self._send_input(_click_inputs(button, clicks))
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error performing click: {e}")
@@ -304,7 +857,14 @@ class WindowManager:
     def type_text(self, text: str, interval: float = 0.1) -> bool:
         """Type text at the current cursor position."""
         try:
-            pyautogui.typewrite(text, interval=interval)
+            if interval > 0:
+                for i, char in enumerate(text):
+                    if i:
+                        time.sleep(interval)
+                    self._send_input(_key_inputs(char))
+            else:
+                # The whole string goes to the input queue in one call
+                self._send_input(_key_inputs(text))
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error typing text: {e}")
@@ -316,6 +876,7 @@ class WindowManager:
             if isinstance(keys, str):
                 keys = [keys]
             
+            pyautogui = self._setup_pyautogui()
             for key in keys:
                 pyautogui.press(key)
             
@@ -327,7 +888,7 @@ class WindowManager:
     def hotkey(self, *args) -> bool:
         """Press a combination of keys."""
         try:
-            pyautogui.hotkey(*args)
+            self._setup_pyautogui().hotkey(*args)
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error with hotkey: {e}")
@@ -353,11 +914,17 @@ class WindowManager:
             self.error_handler.log_error(f"Error logging off: {e}")
             return False
     
+    def _initiate_shutdown(self, restart: bool, force: bool) -> None:
+        """Shut down or restart immediately via InitiateSystemShutdownExW."""
+        advapi32 = _enable_shutdown_privilege()
+        if not advapi32.InitiateSystemShutdownExW(None, None, 0, force, restart,
+                                                  SHTDN_REASON_MAJOR_OTHER | SHTDN_REASON_FLAG_PLANNED):
+            raise ctypes.WinError(ctypes.get_last_error())
+    
     def shutdown(self, force: bool = False) -> bool:
         """Shut down the system."""
         try:
-            import os
-            os.system("shutdown /s /t 0" + (" /f" if force else ""))
+            self._initiate_shutdown(restart=False, force=force)
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error shutting down: {e}")
@@ -366,8 +933,7 @@ class WindowManager:
     def restart(self, force: bool = False) -> bool:
         """Restart the system."""
         try:
-            import os
-            os.system("shutdown /r /t 0" + (" /f" if force else ""))
+            self._initiate_shutdown(restart=True, force=force)
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error restarting: {e}")
@@ -376,7 +942,6 @@ class WindowManager:
     def hibernate(self) -> bool:
         """Hibernate the system."""
         try:
-            import ctypes
             ctypes.windll.PowrProf.SetSuspendState(1, 1, 0)
             return True
         except Exception as e:
@@ -386,7 +951,6 @@ class WindowManager:
     def sleep(self) -> bool:
         """Put the system to sleep."""
         try:
-            import ctypes
             ctypes.windll.PowrProf.SetSuspendState(0, 1, 0)
             return True
         except Exception as e:
@@ -397,11 +961,17 @@ class WindowManager:
         """Set the display state (on/off)."""
         try:
             if state.lower() == 'off':
-                self.user32.SendMessageW(HWND_BROADCAST, WM_SYSCOMMAND, SC_MONITORPOWER, MONITOR_OFF)
+                power = MONITOR_OFF
             elif state.lower() == 'on':
-                self.user32.SendMessageW(HWND_BROADCAST, WM_SYSCOMMAND, SC_MONITORPOWER, MONITOR_ON)
+                power = MONITOR_ON
             else:
                 raise ValueError("State must be 'on' or 'off'")
+            
+            # A plain SendMessageW broadcast blocks for as long as any window is hung
+            result = wintypes.WPARAM()
+            self.user32.SendMessageTimeoutW(HWND_BROADCAST, WM_SYSCOMMAND, SC_MONITORPOWER, power,
+                                            SMTO_ABORTIFHUNG, DISPLAY_STATE_TIMEOUT_MS,
+                                            ctypes.byref(result))
             return True
         except Exception as e:
             self.error_handler.log_error(f"Error setting display state: {e}")